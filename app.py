@@ -5,57 +5,351 @@
 # It handles HTTP requests, routes, and coordinates all the components.
 
 # Import required libraries
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
 import os
+import atexit
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 import json
+import uuid
+import hashlib
+import threading
+import time
 from dotenv import load_dotenv
+from openai import RateLimitError
 from io import BytesIO
-import base64
+from tempfile import SpooledTemporaryFile
+from importlib.util import find_spec
+from types import SimpleNamespace
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
 
 # Import our custom utility classes
 from utils.lyric_parser import LyricParser
 from utils.ai_scorer import AIScorer
 from utils.rhyme_engine import RhymeEngine
+from utils.response_cache import ResponseCache, create_response_cache
+
+# Export libraries are only checked for here, they are imported on first use (see _load_pdf / _load_image)
+# so workers that never export don't pay for importing reportlab and PIL
+PDF_AVAILABLE = find_spec('reportlab') is not None
+if not PDF_AVAILABLE:
+    print("Warning: reportlab not available. PDF export will not work.")
+
+IMAGE_AVAILABLE = find_spec('PIL') is not None
+if not IMAGE_AVAILABLE:
+    print("Warning: PIL not available. Image export will not work.")
 
-# Import export libraries
 try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-    PDF_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    PDF_AVAILABLE = False
-    print("Warning: reportlab not available. PDF export will not work.")
+    ORJSON_AVAILABLE = False
 
+# pybase64 is a SIMD-accelerated drop-in for base64, used for the inline data URL responses
 try:
-    from PIL import Image, ImageDraw, ImageFont
-    from PIL import ImageColor
-    IMAGE_AVAILABLE = True
+    import pybase64 as base64
 except ImportError:
-    IMAGE_AVAILABLE = False
-    print("Warning: PIL not available. Image export will not work.")
+    import base64
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
 
 # Load environment variables from .env file
 # This allows us to store sensitive data like API keys outside of our code
 load_dotenv()
 
+# Log through the logging module so debug output costs nothing unless LOG_LEVEL=DEBUG
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+log = logging.getLogger(__name__)
+
+# Request threads only put log records on a queue, a background thread formats and writes them
+log_handlers = logging.getLogger().handlers[:]
+log_queue = queue.SimpleQueue()
+logging.getLogger().handlers = [QueueHandler(log_queue)]
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+def init_export_worker():
+    """
+    Set up logging in an export worker process
+    The listener thread doesn't survive the fork, so workers write to the handlers directly
+    """
+    logging.getLogger().handlers = log_handlers
+
 # Create Flask application instance
 app = Flask(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that uses orjson for request parsing and jsonify responses
+    The /analyze response is large, and orjson serializes it several times faster than the json module
+    Anything orjson can't handle goes through the default provider
+    """
+    
+    def dumps_bytes(self, obj, **kwargs):
+        """Serialize to UTF-8 bytes, which is what orjson produces and what responses are sent as"""
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            return super().dumps(obj, **kwargs).encode()
+    
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj, **kwargs).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of decoding and re-encoding them,
+        # and skip the pretty-printing the default provider does in debug mode
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 # Set a secret key for session management and security
 # In production, this should be a strong, random key
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'scoremybars-secret-key')
 
+# Don't sort keys on every jsonify, clients don't depend on key order
+app.json.sort_keys = False
+
+# Compress JSON responses (the /analyze payload repeats a lot of lyric text)
+# Brotli is preferred when the client supports it, responses under 1 KB (/sample, /genres) are left alone
+# Set RESPONSE_COMPRESSION=0 to turn compression off, e.g. when a proxy already compresses
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_BR_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 1024
+if COMPRESS_AVAILABLE and os.getenv('RESPONSE_COMPRESSION', '1') == '1':
+    Compress(app)
+
+# Content types for each export file extension
+EXPORT_MIMETYPES = {
+    'pdf': 'application/pdf',
+    'png': 'image/png',
+    'txt': 'text/plain'
+}
+
+# The score categories, in the order they are reported
+SCORE_KEYS = ('cleverness', 'rhyme_density', 'wordplay', 'radio_score')
+get_section_scores = itemgetter(*SCORE_KEYS)  # pulls all four scores out of a section's scores in one call
+
+# Exports up to this size stay in memory, bigger ones spill over to a temporary file
+EXPORT_SPOOL_MAX_SIZE = 1 << 20  # 1 MB
+
+# Timestamp formats for export filenames and the "Generated by ScoreMyBars on ..." footers
+FILENAME_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+GENERATED_FORMAT = '%B %d, %Y at %I:%M %p'
+GENERATED_DATE_FORMAT = '%B %d, %Y'
+
+# Text export building blocks that are the same for every report
+TEXT_EXPORT_RULE = "=" * 50
+TEXT_EXPORT_HEADING_RULE = "-" * 20
+TEXT_EXPORT_HEADER = ("🎤 ScoreMyBars Analysis Report", TEXT_EXPORT_RULE, "")
+TEXT_EXPORT_SCORES = (
+    "Cleverness: {cleverness}/100\n"
+    "Rhyme Density: {rhyme_density}/100\n"
+    "Wordplay: {wordplay}/100\n"
+    "Radio Hit: {radio_score}/100"
+)
+TEXT_EXPORT_SECTION_SCORES = "Scores - Cleverness: {cleverness}, Rhyme: {rhyme_density}, Wordplay: {wordplay}, Radio: {radio_score}"
+
+# Seconds clients are told to wait before retrying when OpenAI is rate limiting us
+RATE_LIMIT_RETRY_AFTER = 10
+RATE_LIMIT_ERROR = {'error': 'Too many requests, please try again shortly'}
+
+# Body of a failed analysis, the exception details stay in the logs
+ANALYSIS_FAILED_ERROR = {'error': 'Analysis failed'}
+
+# How long browsers may reuse /sample and /genres responses before revalidating
+STATIC_JSON_MAX_AGE = 86400  # 1 day
+
+# Sample lyrics served by /sample, serialized once at startup
+SAMPLE_LYRICS = """[Verse 1]
+I'm in the studio, cooking up the heat
+Every bar I spit, got the crowd on their feet
+Metaphors so deep, they can't compete
+Wordplay so fresh, it's a lyrical treat
+
+[Chorus]
+Score my bars, let's see what you got
+AI analysis, give it all you've got
+From the cleverness to the radio spot
+This is hip-hop, and we're taking the top
+
+[Verse 2]
+Double entendres, they don't see it coming
+Punchlines so hard, got the audience humming
+Internal rhymes, the flow is stunning
+This is art, and I'm the one running
+
+[Bridge]
+From boom bap to trap, I can do it all
+Commercial appeal, but still keeping it raw
+This is the future, breaking every wall
+ScoreMyBars, we're answering the call"""
+SAMPLE_RESPONSE_BODY = app.json.dumps({'lyrics': SAMPLE_LYRICS}).encode()
+SAMPLE_RESPONSE_ETAG = hashlib.md5(SAMPLE_RESPONSE_BODY).hexdigest()
+
+# Image export layout: canvas size, where the title is centered, and the distance between report lines
+IMAGE_SIZE = (800, 1200)
+IMAGE_TITLE_Y = 30
+IMAGE_LINE_HEIGHT = 20
+IMAGE_MARGIN = 30
+
+# Export styles and fonts, built by _load_pdf / _load_image the first time they are needed
+_pdf_mod = None
+_image_mod = None
+
+def _load_pdf():
+    """
+    Import reportlab and build the PDF styles on first use
+    Returns a namespace with the styles shared by every PDF export
+    """
+    global _pdf_mod
+    if _pdf_mod is None:
+        from reportlab.platypus import TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER
+        
+        styles = getSampleStyleSheet()
+        
+        # Brand colors, parsed once and shared by every style below
+        accent = colors.HexColor('#ffb347')
+        background = colors.HexColor('#2c3e50')
+        
+        _pdf_mod = SimpleNamespace(
+            accent=accent,
+            background=background,
+            title_style=ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=24,
+                spaceAfter=30,
+                alignment=TA_CENTER,
+                textColor=accent
+            ),
+            heading_style=ParagraphStyle(
+                'CustomHeading',
+                parent=styles['Heading2'],
+                fontSize=16,
+                spaceAfter=12,
+                spaceBefore=20,
+                textColor=accent
+            ),
+            normal_style=ParagraphStyle(
+                'CustomNormal',
+                parent=styles['Normal'],
+                fontSize=11,
+                spaceAfter=6
+            ),
+            footer_style=ParagraphStyle('Footer', parent=styles['Normal'], fontSize=9, alignment=TA_CENTER),
+            score_table_style=TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), accent),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), background),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.white),
+                ('GRID', (0, 0), (-1, -1), 1, colors.white)
+            ])
+        )
+    return _pdf_mod
+
+def _load_image():
+    """
+    Import PIL and load the fonts on first use
+    Returns a namespace with the fonts shared by every image export
+    """
+    global _image_mod
+    if _image_mod is None:
+        from PIL import Image, ImageDraw, ImageFont
+        
+        try:
+            # Try to load a font, fall back to default if not available
+            font_large = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 24)
+            font_medium = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 16)
+            font_small = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 12)
+        except Exception:
+            # Fallback to default font
+            font_large = ImageFont.load_default()
+            font_medium = ImageFont.load_default()
+            font_small = ImageFont.load_default()
+        
+        # Background with the title drawn, every export starts from a copy of it
+        template = Image.new('RGB', IMAGE_SIZE, color=(44, 62, 80))  # Dark blue background
+        ImageDraw.Draw(template).text((IMAGE_SIZE[0]//2, IMAGE_TITLE_Y), "🎤 ScoreMyBars Analysis Report", 
+                                      fill=(255, 179, 71), font=font_large, anchor="mm")
+        
+        _image_mod = SimpleNamespace(
+            template=template,
+            font_large=font_large,
+            font_medium=font_medium,
+            font_small=font_small,
+            # multiline_text spacing is the gap below each line, so subtract the line's own height
+            line_spacing=IMAGE_LINE_HEIGHT - font_small.getbbox("A")[3]
+        )
+    return _image_mod
+
 # Initialize our core components
 # These are the main classes that handle different aspects of lyric analysis
 lyric_parser = LyricParser()  # Breaks down lyrics into sections
 ai_scorer = AIScorer()        # Scores lyrics using AI or rules
 rhyme_engine = RhymeEngine()  # Analyzes rhyme patterns
 
+# Cache of complete /analyze responses
+# The whole analysis is a pure function of the lyrics, genre, song info and model, so repeat submissions skip all the work
+analysis_cache = create_response_cache('analyses')
+
+# Thread pool used to analyze sections in parallel
+# Most of the analysis time is spent waiting on OpenAI, so threads let those calls overlap
+analysis_executor = ThreadPoolExecutor(max_workers=int(os.getenv('ANALYSIS_WORKERS', 8)))
+
+# Separate pool for whole songs in /analyze_batch
+# Songs fan out their sections onto analysis_executor, so sharing one pool could deadlock
+batch_executor = ThreadPoolExecutor(max_workers=int(os.getenv('BATCH_WORKERS', 4)))
+
+# Most songs one /analyze_batch request may contain, so a single request can't queue unbounded work
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 50))
+
+# Process pool for PDF/image exports
+# Building the documents is CPU-bound, so separate processes keep it from holding the GIL
+# and tying up request threads that /analyze needs
+export_executor = ProcessPoolExecutor(max_workers=int(os.getenv('EXPORT_WORKERS', 2)), initializer=init_export_worker)
+
+# How long ?wait=1 export requests block before falling back to polling
+EXPORT_WAIT_TIMEOUT = 30
+
+# Export job bookkeeping, all guarded by export_lock
+# export_jobs: job id -> artifact key
+# export_pending: artifact key -> future of an export that is still being built
+# export_artifacts: artifact key -> (extension, file bytes) of finished exports, oldest first
+export_lock = threading.Lock()
+export_jobs = OrderedDict()
+export_pending = {}
+export_artifacts = OrderedDict()
+EXPORT_JOBS_MAX = 1024
+EXPORT_ARTIFACTS_MAX = int(os.getenv('EXPORT_CACHE_SIZE', 32))
+
 # =============================================================================
 # ROUTES (URL endpoints that the web app responds to)
 # =============================================================================
@@ -75,15 +369,69 @@ def get_genres():
     This allows users to select which genre to compare their lyrics against
     """
     try:
-        genres = ai_scorer.get_available_genres()
-        return jsonify({
-            'success': True,
-            'genres': genres
-        })
+        body, etag = genres_response_body()
+        return static_json_response(body, etag)
     except Exception as e:
-        print(f"❌ Failed to get genres: {str(e)}")
+        log.error("❌ Failed to get genres: %s", e)
         return jsonify({'error': f'Failed to get genres: {str(e)}'}), 500
 
+@lru_cache(maxsize=1)
+def genres_response_body():
+    """
+    Serialize the genre list once, the Billboard data doesn't change while the app is running
+    Returns (JSON bytes, ETag)
+    """
+    body = app.json.dumps({
+        'success': True,
+        'genres': ai_scorer.get_available_genres()
+    }).encode()
+    return body, hashlib.md5(body).hexdigest()
+
+def static_json_response(body, etag):
+    """
+    Return pre-serialized JSON that never changes, with an ETag so browsers can revalidate cheaply
+    Answers 304 Not Modified when the client already has this version
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_JSON_MAX_AGE
+    return response
+
+@app.route('/cachestats', methods=['GET'])
+def get_cache_stats():
+    """
+    API endpoint that reports how well the AI response cache is working
+    Useful for monitoring how many OpenAI calls are being saved
+    """
+    return jsonify({
+        'success': True,
+        'response_cache': ai_scorer.response_cache.stats(),
+        'analysis_cache': analysis_cache.stats(),
+        'semantic_cache': ai_scorer.semantic_cache.stats() if ai_scorer.semantic_cache else None
+    })
+
+@app.route('/health', methods=['GET'])
+def health():
+    """
+    Health check for load balancers and uptime monitors
+    Add ?openai=1 to also test the OpenAI API key, that costs a round trip to OpenAI so plain checks skip it
+    """
+    status = {
+        'success': True,
+        'ai_scoring': ai_scorer.client is not None
+    }
+    if request.args.get('openai') == '1':
+        status['openai_reachable'] = ai_scorer.check_openai()
+        if not status['openai_reachable']:
+            status['success'] = False
+            return jsonify(status), 503
+    return jsonify(status)
+
 @app.route('/analyze', methods=['POST'])
 def analyze_lyrics():
     """
@@ -94,256 +442,605 @@ def analyze_lyrics():
     Returns: JSON with analysis results including scores and breakdowns
     """
     try:
-        print("🔍 Received analyze request") # Debug log
+        log.debug("🔍 Received analyze request")
         
         # Get the JSON data sent from the frontend
         data = request.get_json()
-        print(f"📝 Received data: {data}") # Debug log
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("📝 Received data: %s", data)
         
         lyrics = data.get('lyrics', '').strip()
         selected_genre = data.get('genre', 'hip_hop_rap')  # Default to hip-hop/rap
         song_title = data.get('song_title', '').strip()
         artist_name = data.get('artist_name', '').strip()
         
-        print(f"🎵 Lyrics length: {len(lyrics)} characters") # Debug log
-        print(f"🎼 Selected genre: {selected_genre}") # Debug log
-        print(f"📝 Song title: {song_title}") # Debug log
-        print(f"🎤 Artist name: {artist_name}") # Debug log
+        log.debug("🎵 Lyrics length: %s characters", len(lyrics))
+        log.debug("🎼 Selected genre: %s", selected_genre)
+        log.debug("📝 Song title: %s", song_title)
+        log.debug("🎤 Artist name: %s", artist_name)
         
         # Validate that lyrics were provided
         if not lyrics:
-            print("❌ No lyrics provided") # Debug log
+            log.warning("❌ No lyrics provided")
             return jsonify({'error': 'No lyrics provided'}), 400
         
-        # Step 1: Generate AI song description and sub-genre prediction
-        print("🎯 Generating song description and sub-genre analysis...") # Debug log
-        song_description = ai_scorer.generate_song_description(lyrics, song_title, artist_name, selected_genre)
+        # Run the full analysis (description, sections, insights)
+        response = run_analysis(lyrics, selected_genre, song_title, artist_name)
         
-        # Step 2: Parse lyrics into sections (verse, chorus, etc.)
-        print("📝 Parsing lyrics into sections...") # Debug log
-        sections = lyric_parser.parse_lyrics(lyrics)
-        print(f"📊 Found {len(sections)} sections") # Debug log
+        log.debug("✅ Analysis completed successfully")
+        cache_key = analysis_cache_key(lyrics, selected_genre, song_title, artist_name)
+        return analysis_cache_headers(jsonify(response), cache_key)
+        
+    except RateLimitError as e:
+        # Tell the client to back off instead of retrying straight away
+        log.warning("⏳ OpenAI rate limit hit: %s", e)
+        response = jsonify(RATE_LIMIT_ERROR)
+        response.headers['Retry-After'] = str(RATE_LIMIT_RETRY_AFTER)
+        return response, 429
+        
+    except Exception as e:
+        # If anything goes wrong, return an error message
+        log.exception("❌ Analysis failed with error: %s", e)  # includes the full traceback
+        return jsonify(ANALYSIS_FAILED_ERROR), 500
+
+def analysis_cache_key(lyrics, selected_genre='hip_hop_rap', song_title='', artist_name=''):
+    """
+    Build the cache key (and informational ETag) for an analysis
+    Includes the model and whether AI scoring is on, since both change the results
+    """
+    return ResponseCache.make_key('analysis', ai_scorer.fast_model, ai_scorer.client is not None,
+                                  selected_genre, song_title, artist_name, lyrics)
+
+def analysis_cache_headers(response, cache_key):
+    """
+    Let the browser reuse an analysis it already has for the same input
+    """
+    response.set_etag(cache_key)
+    response.cache_control.private = True
+    response.cache_control.max_age = analysis_cache.ttl
+    return response
+
+def run_analysis(lyrics, selected_genre='hip_hop_rap', song_title='', artist_name=''):
+    """
+    Run the full lyric analysis and build the response payload
+    Shared by the single-song /analyze route and the /analyze_batch route
+    Repeat submissions of the same song are served from analysis_cache, analyses where
+    any AI request fell back to rule-based results are not cached so the next submission retries the AI
+    """
+    cache_key = analysis_cache_key(lyrics, selected_genre, song_title, artist_name)
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        log.debug("⚡ Analysis served from cache")
+        return cached
+    
+    # Step 1: Generate AI song description and sub-genre prediction
+    # It only needs the raw lyrics, so it runs on the thread pool alongside the section analysis
+    log.debug("🎯 Generating song description and sub-genre analysis...")
+    description_future = analysis_executor.submit(
+        ai_scorer.generate_song_description, lyrics, song_title, artist_name, selected_genre
+    )
+    
+    # Step 2: Parse lyrics into sections (verse, chorus, etc.)
+    log.debug("📝 Parsing lyrics into sections...")
+    sections = lyric_parser.parse_lyrics(lyrics)
+    log.debug("📊 Found %s sections", len(sections))
+    
+    # Step 3: Analyze each section and collect results
+    analysis_results = []
+    score_rows = []  # one (cleverness, rhyme_density, wordplay, radio_score) tuple per section
+    total_bars = 0
+    
+    # Score every section and pick its highlights with batched AI requests on the thread pool,
+    # while the rhyme patterns are analyzed locally in parallel
+    batch_future = analysis_executor.submit(ai_scorer.score_sections_batch, sections, selected_genre)
+    rhyme_futures = []
+    for i, section in enumerate(sections):
+        log.debug("🔍 Analyzing section %s: %s", i+1, section['type'])
+        rhyme_futures.append(analysis_executor.submit(rhyme_engine.analyze_rhymes, section['text']))
+    
+    # Collect the results in the original section order
+    section_results, sections_fell_back = batch_future.result()
+    for section, section_ai, rhyme_future in zip(sections, section_results, rhyme_futures):
+        scores = section_ai['scores']
         
-        # Step 3: Analyze each section and collect results
-        analysis_results = []
+        # Combine all the analysis data for this section
+        section_result = {
+            'type': section['type'],                  # verse, chorus, etc.
+            'text': section['text'],                  # the actual lyrics
+            'bar_count': section['bar_count'],        # number of bars
+            'scores': scores,                         # AI scores with genre comparison
+            'rhyme_analysis': rhyme_future.result(),  # rhyme patterns
+            'highlights': section_ai['highlights']    # standout lines
+        }
+        
+        analysis_results.append(section_result)
+        
+        # Keep the scores for the overall average calculation
+        score_rows.append(get_section_scores(scores))
+        total_bars += section['bar_count']
+    
+    # Step 4: Calculate overall scores (average of all sections)
+    num_sections = len(score_rows)
+    if num_sections > 0:
         total_scores = {
-            'cleverness': 0,
-            'rhyme_density': 0,
-            'wordplay': 0,
-            'radio_score': 0
+            key: round(sum(column) / num_sections, 1)
+            for key, column in zip(SCORE_KEYS, zip(*score_rows))
         }
+    else:
+        total_scores = dict.fromkeys(SCORE_KEYS, 0)
+    
+    # Step 5: Generate additional insights with genre context
+    # These are quick rule-based calculations, so they run inline rather than on the pool
+    log.debug("🎯 Generating insights...")
+    genre_prediction = ai_scorer.predict_genre(analysis_results, selected_genre)
+    popularity_prediction = ai_scorer.predict_popularity(total_scores)
+    suggestions = ai_scorer.generate_suggestions(total_scores, analysis_results)
+    
+    # Get genre information for comparison, built once per genre
+    selected_genre_info, billboard_comparison = genre_response_fields(selected_genre)
+    
+    # Step 6: Prepare the complete response
+    song_description, description_fell_back = description_future.result()
+    response = {
+        'success': True,
+        'song_metadata': {                      # Song information
+            'title': song_title,
+            'artist': artist_name,
+            'description': song_description
+        },
+        'sections': analysis_results,           # Detailed breakdown by section
+        'overall_scores': total_scores,         # Overall scores
+        'genre_prediction': genre_prediction,   # Predicted genre
+        'popularity_prediction': popularity_prediction,  # Popularity estimate
+        'suggestions': suggestions,             # Improvement suggestions
+        'total_bars': total_bars,               # Total bar count
+        'selected_genre': selected_genre_info,  # Information about selected genre
+        'billboard_comparison': billboard_comparison  # Billboard comparison context
+    }
+    
+    if sections_fell_back or description_fell_back:
+        log.warning("⚠️ Analysis used rule-based fallbacks, not caching it")
+    else:
+        analysis_cache.set(cache_key, response)
+    
+    return response
+
+@lru_cache(maxsize=64)
+def genre_response_fields(selected_genre):
+    """
+    Build the 'selected_genre' and 'billboard_comparison' parts of an analysis response
+    They only depend on the genre, so each genre's are built once and shared by every response
+    """
+    genre_info = ai_scorer.get_genre_info(selected_genre)
+    genre_name = genre_info['name']
+    
+    selected_genre_info = {
+        'key': selected_genre,
+        'name': genre_name,
+        'description': genre_info['description']
+    }
+    billboard_comparison = {
+        'description': f'Your lyrics were compared to Billboard Hot 100 hits in the {genre_name} genre',
+        'top_songs': genre_info['top_songs']  # Top 3 songs for reference
+    }
+    return selected_genre_info, billboard_comparison
+
+@app.route('/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """
+    API endpoint that analyzes several songs in a single request
+    Useful for scoring a whole playlist without one HTTP round trip per song
+    
+    Expected input: JSON with a 'requests' list, each item shaped like an /analyze body plus an 'id'
+    Returns: JSON with a 'responses' list containing 'id', 'status' and 'body' for each item
+    """
+    try:
+        data = request.get_json(silent=True)
+        items = data.get('requests', []) if isinstance(data, dict) else None
         
-        # Loop through each section and analyze it
-        for i, section in enumerate(sections):
-            print(f"🔍 Analyzing section {i+1}: {section['type']}") # Debug log
-            
-            # Get AI scores for this section with genre comparison
-            scores = ai_scorer.score_section(section, selected_genre)
-            
-            # Get rhyme analysis for this section
-            rhyme_analysis = rhyme_engine.analyze_rhymes(section['text'])
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'No requests provided'}), 400
+        
+        if len(items) > BATCH_MAX_ITEMS:
+            return jsonify({'error': f'Too many requests, at most {BATCH_MAX_ITEMS} songs per batch'}), 400
+        
+        log.debug("📦 Received batch analyze request with %s items", len(items))
+        
+        # Dedupe identical songs so a playlist with repeats only pays for each one once
+        # Each entry is (id, future) or (id, error message) for items rejected up front
+        futures = {}
+        responses = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                responses.append((index, 'Each request must be a JSON object'))
+                continue
             
-            # Combine all the analysis data for this section
-            section_result = {
-                'type': section['type'],           # verse, chorus, etc.
-                'text': section['text'],           # the actual lyrics
-                'bar_count': section['bar_count'], # number of bars
-                'scores': scores,                  # AI scores with genre comparison
-                'rhyme_analysis': rhyme_analysis,  # rhyme patterns
-                'highlights': ai_scorer.get_highlights(section['text'])  # standout lines
-            }
+            item_id = item.get('id', index)
+            lyrics = item.get('lyrics', '')
+            song_title = item.get('song_title', '')
+            artist_name = item.get('artist_name', '')
+            genre = item.get('genre', 'hip_hop_rap')
+            if not all(isinstance(value, str) for value in (lyrics, song_title, artist_name, genre)):
+                responses.append((item_id, 'lyrics, genre, song_title and artist_name must be strings'))
+                continue
             
-            analysis_results.append(section_result)
+            lyrics = lyrics.strip()
+            if not lyrics:
+                responses.append((item_id, 'No lyrics provided'))
+                continue
             
-            # Add up scores for overall average calculation
-            for key in total_scores:
-                total_scores[key] += scores[key]
-        
-        # Step 4: Calculate overall scores (average of all sections)
-        num_sections = len(analysis_results)
-        if num_sections > 0:
-            for key in total_scores:
-                total_scores[key] = round(total_scores[key] / num_sections, 1)
-        
-        # Step 5: Generate additional insights with genre context
-        print("🎯 Generating insights...") # Debug log
-        genre_prediction = ai_scorer.predict_genre(analysis_results, selected_genre)
-        popularity_prediction = ai_scorer.predict_popularity(total_scores)
-        suggestions = ai_scorer.generate_suggestions(total_scores, analysis_results)
-        
-        # Get genre information for comparison
-        genre_data = ai_scorer.billboard_data.get('genres', {}).get(selected_genre, {})
-        genre_name = genre_data.get('name', selected_genre.replace('_', ' ').title())
-        genre_description = genre_data.get('description', '')
-        
-        # Step 6: Prepare the complete response
-        response = {
-            'success': True,
-            'song_metadata': {                      # Song information
-                'title': song_title,
-                'artist': artist_name,
-                'description': song_description
-            },
-            'sections': analysis_results,           # Detailed breakdown by section
-            'overall_scores': total_scores,         # Overall scores
-            'genre_prediction': genre_prediction,   # Predicted genre
-            'popularity_prediction': popularity_prediction,  # Popularity estimate
-            'suggestions': suggestions,             # Improvement suggestions
-            'total_bars': sum(section['bar_count'] for section in analysis_results),  # Total bar count
-            'selected_genre': {                     # Information about selected genre
-                'key': selected_genre,
-                'name': genre_name,
-                'description': genre_description
-            },
-            'billboard_comparison': {               # Billboard comparison context
-                'description': f'Your lyrics were compared to Billboard Hot 100 hits in the {genre_name} genre',
-                'top_songs': genre_data.get('top_songs', [])[:3]  # Top 3 songs for reference
-            }
-        }
+            song_key = (lyrics, genre, song_title.strip(), artist_name.strip())
+            if song_key not in futures:
+                futures[song_key] = batch_executor.submit(run_analysis, *song_key)
+            responses.append((item_id, futures[song_key]))
+        
+        # Collect the results in the original request order
+        batch_responses = []
+        for item_id, pending in responses:
+            if isinstance(pending, str):
+                batch_responses.append({'id': item_id, 'status': 400, 'body': {'error': pending}})
+                continue
+            try:
+                batch_responses.append({'id': item_id, 'status': 200, 'body': pending.result()})
+            except RateLimitError as e:
+                log.warning("⏳ OpenAI rate limit hit on batch item %s: %s", item_id, e)
+                batch_responses.append({'id': item_id, 'status': 429, 'body': RATE_LIMIT_ERROR})
+            except Exception as e:
+                log.error("❌ Batch item %s failed with error: %s", item_id, e)
+                batch_responses.append({'id': item_id, 'status': 500, 'body': ANALYSIS_FAILED_ERROR})
         
-        print("✅ Analysis completed successfully") # Debug log
-        return jsonify(response)
+        return jsonify({'responses': batch_responses})
         
     except Exception as e:
-        # If anything goes wrong, return an error message
-        print(f"❌ Analysis failed with error: {str(e)}") # Debug log
-        import traceback
-        traceback.print_exc() # Print full error traceback
-        return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
+        log.exception("❌ Batch analysis failed with error: %s", e)
+        return jsonify({'error': 'Batch analysis failed'}), 500
+
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+def sse_response(events):
+    """Stream Server-Sent Events, telling proxies not to buffer them so each one arrives as soon as it is sent"""
+    return Response(events, mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/describe_stream', methods=['POST'])
+def describe_stream():
+    """
+    API endpoint that streams the song description as Server-Sent Events
+    Each field is sent as soon as the AI has written it, so the page can show the description while the rest is still coming
+    
+    Expected input: JSON shaped like an /analyze body ('lyrics', 'genre', 'song_title', 'artist_name')
+    Returns: a 'field' event ({"field": ..., "value": ...}) for every description field, then a 'done' event
+    """
+    # Reject bad bodies before the event stream starts, once it has started the status is already 200
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    lyrics = data.get('lyrics', '')
+    selected_genre = data.get('genre', 'hip_hop_rap')
+    song_title = data.get('song_title', '')
+    artist_name = data.get('artist_name', '')
+    if not all(isinstance(value, str) for value in (lyrics, selected_genre, song_title, artist_name)):
+        return jsonify({'error': 'lyrics, genre, song_title and artist_name must be strings'}), 400
+    
+    lyrics = lyrics.strip()
+    if not lyrics:
+        return jsonify({'error': 'No lyrics provided'}), 400
+    song_title = song_title.strip()
+    artist_name = artist_name.strip()
+    
+    def events():
+        for field, value in ai_scorer.generate_song_description_stream(lyrics, song_title, artist_name, selected_genre):
+            yield sse_event('field', {'field': field, 'value': value})
+        yield sse_event('done', {})
+    
+    return sse_response(events())
+
+@app.route('/highlights_stream', methods=['POST'])
+def highlights_stream():
+    """
+    API endpoint that streams a section's standout lines as Server-Sent Events, one event per highlight
+    
+    Expected input: JSON with a 'text' field containing the section lyrics
+    Returns: a 'highlight' event ({"highlight": ...}) for every standout line, then a 'done' event
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    text = data.get('text', '')
+    if not isinstance(text, str):
+        return jsonify({'error': 'text must be a string'}), 400
+    
+    text = text.strip()
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    
+    def events():
+        for highlight in ai_scorer.get_highlights_stream(text):
+            yield sse_event('highlight', {'highlight': highlight})
+        yield sse_event('done', {})
+    
+    return sse_response(events())
 
 @app.route('/export', methods=['POST'])
 def export_results():
     """
     API endpoint for exporting analysis results as PDF or image
     This allows users to save and share their results
+    
+    The export is built in the background and the response is {"job_id": ...} with status 202,
+    poll /export/<job_id> to download the file once it is ready
+    Add ?wait=1 to wait for the file in the same request instead
+    Add ?inline=1 to get a JSON response with a base64 data URL instead (implies ?wait=1)
     """
     try:
         data = request.get_json()
         export_type = data.get('type', 'pdf')  # pdf or image
         analysis_data = data.get('analysis_data', {})
+        inline = request.args.get('inline') == '1'
+        wait = inline or request.args.get('wait') == '1'
         
-        print(f"📤 Export request received: {export_type}")
-        print(f"📊 PDF_AVAILABLE: {PDF_AVAILABLE}")
-        print(f"📊 IMAGE_AVAILABLE: {IMAGE_AVAILABLE}")
-        
-        if export_type == 'pdf':
-            if not PDF_AVAILABLE:
-                print("⚠️ PDF export not available, falling back to text")
-                # Fallback to text-based export
-                text_content = generate_text_export(analysis_data)
-                return jsonify({
-                    'success': True,
-                    'download_url': f"data:text/plain;base64,{base64.b64encode(text_content.encode()).decode()}",
-                    'filename': f'scoremybars_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
-                })
-            
-            try:
-                # Generate PDF export
-                print("📄 Generating PDF export...")
-                pdf_buffer = generate_pdf_export(analysis_data)
-                print("✅ PDF generated successfully")
-                return jsonify({
-                    'success': True,
-                    'download_url': f"data:application/pdf;base64,{base64.b64encode(pdf_buffer.getvalue()).decode()}",
-                    'filename': f'scoremybars_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
-                })
-            except Exception as e:
-                print(f"❌ PDF generation failed: {e}")
-                # Fallback to text-based export
-                text_content = generate_text_export(analysis_data)
-                return jsonify({
-                    'success': True,
-                    'download_url': f"data:text/plain;base64,{base64.b64encode(text_content.encode()).decode()}",
-                    'filename': f'scoremybars_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
-                })
-                
-        elif export_type == 'image':
-            if not IMAGE_AVAILABLE:
-                print("⚠️ Image export not available, falling back to text")
-                # Fallback to text-based export
-                text_content = generate_text_export(analysis_data)
-                return jsonify({
-                    'success': True,
-                    'download_url': f"data:text/plain;base64,{base64.b64encode(text_content.encode()).decode()}",
-                    'filename': f'scoremybars_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
-                })
-            
-            try:
-                # Generate image export
-                print("🖼️ Generating image export...")
-                image_buffer = generate_image_export(analysis_data)
-                print("✅ Image generated successfully")
-                return jsonify({
-                    'success': True,
-                    'download_url': f"data:image/png;base64,{base64.b64encode(image_buffer.getvalue()).decode()}",
-                    'filename': f'scoremybars_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png'
-                })
-            except Exception as e:
-                print(f"❌ Image generation failed: {e}")
-                # Fallback to text-based export
-                text_content = generate_text_export(analysis_data)
-                return jsonify({
-                    'success': True,
-                    'download_url': f"data:text/plain;base64,{base64.b64encode(text_content.encode()).decode()}",
-                    'filename': f'scoremybars_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
-                })
-        else:
+        log.debug("📤 Export request received: %s", export_type)
+        
+        if export_type not in ('pdf', 'image'):
             return jsonify({'error': 'Invalid export type'}), 400
+        
+        job_id = submit_export(export_type, analysis_data)
+        
+        if wait:
+            return export_job_response(job_id, inline, timeout=EXPORT_WAIT_TIMEOUT)
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status_url': f'/export/{job_id}'
+        }), 202
             
     except Exception as e:
-        print(f"Export error: {e}")
+        log.error("Export error: %s", e)
         return jsonify({'error': f'Export failed: {str(e)}'}), 500
 
+@app.route('/export/<job_id>', methods=['GET'])
+def export_status(job_id):
+    """
+    API endpoint for polling a background export
+    Returns 202 while the file is being built, then streams it as a download
+    Add ?inline=1 to get a JSON response with a base64 data URL instead
+    """
+    try:
+        return export_job_response(job_id, request.args.get('inline') == '1')
+    except Exception as e:
+        log.error("Export error: %s", e)
+        return jsonify({'error': f'Export failed: {str(e)}'}), 500
+
+def submit_export(export_type, analysis_data):
+    """
+    Queue an export on the process pool and return its job id
+    Identical exports within the same minute share one artifact, so repeats are served from the cache or join the running job
+    """
+    # The minute is part of the key so a cached file never carries an out of date "Generated on" footer
+    minute = int(time.time() // 60)
+    artifact_key = hashlib.sha256(json.dumps([export_type, minute, analysis_data], sort_keys=True).encode()).hexdigest()
+    job_id = uuid.uuid4().hex
+    
+    future = None
+    with export_lock:
+        export_jobs[job_id] = artifact_key
+        while len(export_jobs) > EXPORT_JOBS_MAX:
+            export_jobs.popitem(last=False)
+        
+        if artifact_key in export_artifacts:
+            log.debug("⚡ Export served from cache")
+            export_artifacts.move_to_end(artifact_key)
+        elif artifact_key not in export_pending:
+            future = export_executor.submit(build_export, export_type, analysis_data)
+            export_pending[artifact_key] = future
+    
+    if future is not None:
+        # Registered outside the lock, a job that already finished runs the callback right here and store_export takes export_lock itself
+        future.add_done_callback(lambda done: store_export(artifact_key, done))
+    
+    return job_id
+
+def store_export(artifact_key, future):
+    """
+    Move a finished export from the pending table into the artifact cache
+    """
+    with export_lock:
+        export_pending.pop(artifact_key, None)
+        if future.exception() is not None:
+            log.error("❌ Export job failed: %s", future.exception())
+            return
+        export_artifacts[artifact_key] = future.result()
+        while len(export_artifacts) > EXPORT_ARTIFACTS_MAX:
+            export_artifacts.popitem(last=False)
+
+def export_job_response(job_id, inline=False, timeout=None):
+    """
+    Build the HTTP response for an export job
+    Waits up to timeout seconds for a pending job, otherwise answers 202 so the client polls again
+    """
+    artifact, error_response = export_job_artifact(job_id, timeout)
+    if error_response is not None:
+        return error_response
+    
+    extension, file_bytes = artifact
+    return export_response(BytesIO(file_bytes), extension, inline)
+
+def export_job_artifact(job_id, timeout=None):
+    """
+    Get the (extension, file bytes) of an export job, waiting up to timeout seconds for a pending job
+    Returns (artifact, None), or (None, error response) when the job is unknown, failed or still pending
+    """
+    with export_lock:
+        artifact_key = export_jobs.get(job_id)
+        artifact = export_artifacts.get(artifact_key)
+        future = export_pending.get(artifact_key)
+    
+    if artifact_key is None:
+        return None, (jsonify({'error': 'Unknown export job'}), 404)
+    
+    if artifact is None and future is not None:
+        try:
+            artifact = future.result(timeout=timeout or 0)
+        except FutureTimeoutError:
+            return None, (jsonify({'success': True, 'job_id': job_id, 'status': 'pending'}), 202)
+        except Exception as e:
+            log.error("Export error: %s", e)
+            return None, (jsonify({'error': f'Export failed: {str(e)}'}), 500)
+    
+    if artifact is None:
+        # The job failed, or its artifact was evicted from the cache
+        return None, (jsonify({'error': 'Export is no longer available, please export again'}), 410)
+    
+    return artifact, None
+
+def build_export(export_type, analysis_data):
+    """
+    Generate an export file, returns (extension, file bytes)
+    Runs in an export worker process; falls back to a text export if the PDF/image can't be built
+    """
+    log.debug("📊 PDF_AVAILABLE: %s", PDF_AVAILABLE)
+    log.debug("📊 IMAGE_AVAILABLE: %s", IMAGE_AVAILABLE)
+    
+    if export_type == 'pdf':
+        if not PDF_AVAILABLE:
+            log.warning("⚠️ PDF export not available, falling back to text")
+            # Fallback to text-based export
+            return 'txt', text_export_buffer(analysis_data).read()
+        
+        try:
+            # Generate PDF export
+            log.debug("📄 Generating PDF export...")
+            pdf_buffer = generate_pdf_export(analysis_data)
+            log.debug("✅ PDF generated successfully")
+            return 'pdf', pdf_buffer.read()
+        except Exception as e:
+            log.error("❌ PDF generation failed: %s", e)
+            # Fallback to text-based export
+            return 'txt', text_export_buffer(analysis_data).read()
+    
+    if not IMAGE_AVAILABLE:
+        log.warning("⚠️ Image export not available, falling back to text")
+        # Fallback to text-based export
+        return 'txt', text_export_buffer(analysis_data).read()
+    
+    try:
+        # Generate image export
+        log.debug("🖼️ Generating image export...")
+        image_buffer = generate_image_export(analysis_data)
+        log.debug("✅ Image generated successfully")
+        return 'png', image_buffer.read()
+    except Exception as e:
+        log.error("❌ Image generation failed: %s", e)
+        # Fallback to text-based export
+        return 'txt', text_export_buffer(analysis_data).read()
+
+def filename_timestamp():
+    """
+    Timestamp used in export and share filenames
+    """
+    return datetime.now().strftime(FILENAME_TIMESTAMP_FORMAT)
+
+def generated_timestamp(fmt=GENERATED_FORMAT):
+    """
+    Current time formatted for export footers
+    These formats stop at the minute, so the string is only rebuilt once a minute
+    """
+    return _format_minute(int(time.time() // 60), fmt)
+
+@lru_cache(maxsize=4)
+def _format_minute(minute, fmt):
+    return datetime.fromtimestamp(minute * 60).strftime(fmt)
+
+def export_response(buffer, extension, inline=False):
+    """
+    Build the HTTP response for an exported file
+    Streams the file as a download, or wraps it in a base64 data URL when inline is requested
+    """
+    mimetype = EXPORT_MIMETYPES[extension]
+    filename = f'scoremybars_analysis_{filename_timestamp()}.{extension}'
+    
+    if inline:
+        return jsonify({
+            'success': True,
+            'download_url': f"data:{mimetype};base64,{base64.b64encode(buffer.read()).decode()}",
+            'filename': filename
+        })
+    
+    return send_file(buffer, mimetype=mimetype, as_attachment=True, download_name=filename)
+
+def text_export_buffer(analysis_data):
+    """
+    Generate the text export wrapped in a file-like buffer so it can be streamed like the others
+    """
+    return BytesIO(generate_text_export(analysis_data).encode())
+
 @app.route('/share', methods=['POST'])
 def share_results():
     """
     API endpoint for sharing analysis results as an image
     This generates an image that can be shared on social media
+    
+    The PNG is built on the export process pool and shares its artifact cache with /export,
+    then streamed back as a binary download
+    Add ?inline=1 to get the old JSON response with base64 image data instead
     """
     try:
         data = request.get_json()
         analysis_data = data.get('analysis_data', {})
         
-        print("📱 Share request received")
+        log.debug("📱 Share request received")
         
         if not IMAGE_AVAILABLE:
-            print("⚠️ Image generation not available for sharing")
+            log.warning("⚠️ Image generation not available for sharing")
             return jsonify({'error': 'Image sharing not available'}), 400
         
-        try:
-            # Generate image export
-            print("🖼️ Generating image for sharing...")
-            image_buffer = generate_image_export(analysis_data)
-            print("✅ Share image generated successfully")
-            
+        # Generate the image on the export pool, an identical export or share reuses its file
+        log.debug("🖼️ Generating image for sharing...")
+        job_id = submit_export('image', analysis_data)
+        artifact, error_response = export_job_artifact(job_id, timeout=EXPORT_WAIT_TIMEOUT)
+        if error_response is not None:
+            if error_response[1] == 202:
+                # Still rendering, a retry joins the running job instead of starting over
+                return jsonify({'error': 'Share image is still being generated, please try again'}), 503
+            return error_response
+        
+        extension, file_bytes = artifact
+        if extension != 'png':
+            # build_export fell back to a text export, there is no image to share
+            log.error("❌ Share image generation failed")
+            return jsonify({'error': 'Failed to generate share image'}), 500
+        log.debug("✅ Share image generated successfully")
+        
+        filename = f'scoremybars_share_{filename_timestamp()}.png'
+        
+        if request.args.get('inline') == '1':
             # Return the image data for sharing
             return jsonify({
                 'success': True,
-                'image_data': base64.b64encode(image_buffer.getvalue()).decode(),
-                'filename': f'scoremybars_share_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png'
+                'image_data': base64.b64encode(file_bytes).decode(),
+                'filename': filename
             })
-        except Exception as e:
-            print(f"❌ Share image generation failed: {e}")
-            return jsonify({'error': f'Failed to generate share image: {str(e)}'}), 500
+        
+        return send_file(BytesIO(file_bytes), mimetype='image/png', as_attachment=True, download_name=filename)
             
     except Exception as e:
-        print(f"Share error: {e}")
+        log.error("Share error: %s", e)
         return jsonify({'error': f'Share failed: {str(e)}'}), 500
 
 def generate_text_export(analysis_data):
     """
     Generate text-based export when PDF/Image libraries are not available
     """
-    lines = []
-    lines.append("🎤 ScoreMyBars Analysis Report")
-    lines.append("=" * 50)
-    lines.append("")
+    lines = list(TEXT_EXPORT_HEADER)
     
     # Song Information
     song_metadata = analysis_data.get('song_metadata', {})
     if song_metadata:
-        lines.append("📝 Song Information")
-        lines.append("-" * 20)
+        lines.extend(("📝 Song Information", TEXT_EXPORT_HEADING_RULE))
         lines.append(f"Title: {song_metadata.get('title', 'Untitled')}")
         lines.append(f"Artist: {song_metadata.get('artist', 'Unknown Artist')}")
         
@@ -363,19 +1060,17 @@ def generate_text_export(analysis_data):
     # Overall Scores
     overall_scores = analysis_data.get('overall_scores', {})
     if overall_scores:
-        lines.append("📊 Overall Scores")
-        lines.append("-" * 20)
-        lines.append(f"Cleverness: {overall_scores.get('cleverness', 0)}/100")
-        lines.append(f"Rhyme Density: {overall_scores.get('rhyme_density', 0)}/100")
-        lines.append(f"Wordplay: {overall_scores.get('wordplay', 0)}/100")
-        lines.append(f"Radio Hit: {overall_scores.get('radio_score', 0)}/100")
-        lines.append("")
+        lines.extend((
+            "📊 Overall Scores",
+            TEXT_EXPORT_HEADING_RULE,
+            TEXT_EXPORT_SCORES.format_map({key: overall_scores.get(key, 0) for key in SCORE_KEYS}),
+            ""
+        ))
     
     # Section Breakdown
     sections = analysis_data.get('sections', [])
     if sections:
-        lines.append("📝 Section Breakdown")
-        lines.append("-" * 20)
+        lines.extend(("📝 Section Breakdown", TEXT_EXPORT_HEADING_RULE))
         
         for i, section in enumerate(sections, 1):
             lines.append(f"Section {i}: {section.get('type', 'Unknown').title()}")
@@ -383,31 +1078,31 @@ def generate_text_export(analysis_data):
             
             scores = section.get('scores', {})
             if scores:
-                lines.append(f"Scores - Cleverness: {scores.get('cleverness', 0)}, Rhyme: {scores.get('rhyme_density', 0)}, Wordplay: {scores.get('wordplay', 0)}, Radio: {scores.get('radio_score', 0)}")
+                lines.append(TEXT_EXPORT_SECTION_SCORES.format_map({key: scores.get(key, 0) for key in SCORE_KEYS}))
             
             # Show first few lines of lyrics
             text = section.get('text', '')
             if text:
                 lines.append("Lyrics Preview:")
-                preview_lines = text.split('\n')[:3]
-                for line in preview_lines:
+                # Split off at most 3 lines, a 4th part means there is more text
+                preview_lines = text.split('\n', 3)
+                for line in preview_lines[:3]:
                     lines.append(f"  {line}")
-                if len(text.split('\n')) > 3:
+                if len(preview_lines) > 3:
                     lines.append("  ...")
             lines.append("")
     
     # Suggestions
     suggestions = analysis_data.get('suggestions', [])
     if suggestions:
-        lines.append("💡 Improvement Suggestions")
-        lines.append("-" * 20)
+        lines.extend(("💡 Improvement Suggestions", TEXT_EXPORT_HEADING_RULE))
         for suggestion in suggestions:
             lines.append(f"• {suggestion}")
         lines.append("")
     
     # Footer
-    lines.append("=" * 50)
-    lines.append(f"Generated by ScoreMyBars on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
+    lines.append(TEXT_EXPORT_RULE)
+    lines.append(f"Generated by ScoreMyBars on {generated_timestamp()}")
     
     return '\n'.join(lines)
 
@@ -415,36 +1110,19 @@ def generate_pdf_export(analysis_data):
     """
     Generate PDF export of analysis results using reportlab
     """
-    buffer = BytesIO()
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+    from reportlab.lib.units import inch
+    
+    buffer = SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
     doc = SimpleDocTemplate(buffer, pagesize=A4)
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#ffb347')
-    )
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        spaceBefore=20,
-        textColor=colors.HexColor('#ffb347')
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=6
-    )
+    # Styles are built once, on the first export
+    pdf = _load_pdf()
+    title_style = pdf.title_style
+    heading_style = pdf.heading_style
+    normal_style = pdf.normal_style
     
     # Title
     story.append(Paragraph("🎤 ScoreMyBars Analysis Report", title_style))
@@ -485,17 +1163,7 @@ def generate_pdf_export(analysis_data):
         ]
         
         score_table = Table(score_data, colWidths=[2*inch, 1*inch])
-        score_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ffb347')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.white)
-        ]))
+        score_table.setStyle(pdf.score_table_style)
         story.append(score_table)
         story.append(Spacer(1, 20))
     
@@ -515,10 +1183,9 @@ def generate_pdf_export(analysis_data):
             # Show first few lines of lyrics
             text = section.get('text', '')
             if text:
-                lines = text.split('\n')[:3]  # Show first 3 lines
-                preview = '\n'.join(lines)
-                if len(text.split('\n')) > 3:
-                    preview += '\n...'
+                # Show first 3 lines, a 4th part from the split means there is more text
+                lines = text.split('\n', 3)
+                preview = '\n'.join(lines[:3]) + ('\n...' if len(lines) > 3 else '')
                 story.append(Paragraph(f"<i>Lyrics Preview:</i><br/>{preview}", normal_style))
             
             story.append(Spacer(1, 10))
@@ -533,78 +1200,101 @@ def generate_pdf_export(analysis_data):
     
     # Footer
     story.append(Spacer(1, 30))
-    story.append(Paragraph(f"Generated by ScoreMyBars on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", 
-                          ParagraphStyle('Footer', parent=styles['Normal'], fontSize=9, alignment=TA_CENTER)))
+    story.append(Paragraph(f"Generated by ScoreMyBars on {generated_timestamp()}", 
+                          pdf.footer_style))
     
     doc.build(story)
     buffer.seek(0)
     return buffer
 
+def wrap_to_width(text, font, max_width):
+    """
+    Word-wrap text so every line fits in max_width pixels when drawn with font
+    Each word is measured once, a word wider than a whole line gets a line of its own
+    """
+    space_width = font.getlength(" ")
+    lines = []
+    current_words = []
+    current_width = 0
+    
+    for word in text.split():
+        word_width = font.getlength(word)
+        if current_words and current_width + space_width + word_width > max_width:
+            lines.append(" ".join(current_words))
+            current_words = [word]
+            current_width = word_width
+        else:
+            current_width += word_width + (space_width if current_words else 0)
+            current_words.append(word)
+    
+    if current_words:
+        lines.append(" ".join(current_words))
+    
+    return lines
+
 def generate_image_export(analysis_data):
     """
     Generate image export of analysis results using PIL
     """
+    from PIL import ImageDraw
+    
+    # Fonts and the background with the title already drawn are prepared once, on the first export
+    fonts = _load_image()
+    font_medium = fonts.font_medium
+    font_small = fonts.font_small
+    
     # Create image
-    width, height = 800, 1200
-    image = Image.new('RGB', (width, height), color=(44, 62, 80))  # Dark blue background
+    image = fonts.template.copy()
+    width, height = image.size
     draw = ImageDraw.Draw(image)
     
-    try:
-        # Try to load a font, fall back to default if not available
-        font_large = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 24)
-        font_medium = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 16)
-        font_small = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 12)
-    except:
-        # Fallback to default font
-        font_large = ImageFont.load_default()
-        font_medium = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-    
-    y_position = 30
+    # The title is part of the template
+    y_position = IMAGE_TITLE_Y + 60
     
-    # Title
-    draw.text((width//2, y_position), "🎤 ScoreMyBars Analysis Report", 
-              fill=(255, 179, 71), font=font_large, anchor="mm")
-    y_position += 60
+    def draw_heading(y, heading):
+        """Draw a section heading, return the next y position"""
+        draw.text((IMAGE_MARGIN, y), heading, fill=(255, 179, 71), font=font_medium)
+        return y + 30
+    
+    def draw_lines(y, lines, gap_after=30):
+        """Draw a block of lines in a single multiline pass, return the next y position"""
+        draw.multiline_text((IMAGE_MARGIN, y), "\n".join(lines), fill=(255, 255, 255),
+                            font=font_small, spacing=fonts.line_spacing)
+        # Lines are IMAGE_LINE_HEIGHT apart, the block is followed by gap_after
+        return y + IMAGE_LINE_HEIGHT * (len(lines) - 1) + gap_after
     
     # Song Information
     song_metadata = analysis_data.get('song_metadata', {})
     if song_metadata:
-        draw.text((30, y_position), "📝 Song Information", fill=(255, 179, 71), font=font_medium)
-        y_position += 30
-        
-        draw.text((30, y_position), f"Title: {song_metadata.get('title', 'Untitled')}", fill=(255, 255, 255), font=font_small)
-        y_position += 20
-        
-        draw.text((30, y_position), f"Artist: {song_metadata.get('artist', 'Unknown Artist')}", fill=(255, 255, 255), font=font_small)
-        y_position += 30
+        y_position = draw_heading(y_position, "📝 Song Information")
+        y_position = draw_lines(y_position, [
+            f"Title: {song_metadata.get('title', 'Untitled')}",
+            f"Artist: {song_metadata.get('artist', 'Unknown Artist')}",
+        ])
         
         description = song_metadata.get('description', {})
         if description:
-            draw.text((30, y_position), f"Sub-Genre: {description.get('sub_genre', 'Unknown')}", fill=(255, 255, 255), font=font_small)
-            y_position += 20
-            
-            draw.text((30, y_position), f"Mood: {description.get('mood', 'Unknown')}", fill=(255, 255, 255), font=font_small)
-            y_position += 20
-            
+            lines = [
+                f"Sub-Genre: {description.get('sub_genre', 'Unknown')}",
+                f"Mood: {description.get('mood', 'Unknown')}",
+            ]
             themes = description.get('themes', [])
             if themes:
-                draw.text((30, y_position), f"Themes: {', '.join(themes)}", fill=(255, 255, 255), font=font_small)
-                y_position += 30
+                lines.append(f"Themes: {', '.join(themes)}")
+            y_position = draw_lines(y_position, lines, gap_after=30 if themes else 20)
         
         y_position += 20
     
     # Overall Scores
     overall_scores = analysis_data.get('overall_scores', {})
     if overall_scores:
-        draw.text((30, y_position), "📊 Overall Scores", fill=(255, 179, 71), font=font_medium)
-        y_position += 30
+        y_position = draw_heading(y_position, "📊 Overall Scores")
         
         categories = ['Cleverness', 'Rhyme Density', 'Wordplay', 'Radio Hit']
-        for category in categories:
-            score = overall_scores.get(category.lower().replace(' ', '_'), 0)
-            draw.text((30, y_position), f"{category}: {score}/100", fill=(255, 255, 255), font=font_small)
-            y_position += 20
+        y_position = draw_lines(y_position, [
+            f"{category}: {overall_scores.get(category.lower().replace(' ', '_'), 0)}/100"
+            for category in categories
+        ], gap_after=20)
         
         y_position += 20
     
@@ -613,49 +1303,35 @@ def generate_image_export(analysis_data):
     sections_count = len(analysis_data.get('sections', []))
     genre_prediction = analysis_data.get('genre_prediction', 'Unknown')
     
-    draw.text((30, y_position), "🎯 Summary", fill=(255, 179, 71), font=font_medium)
-    y_position += 30
-    
-    draw.text((30, y_position), f"Total Bars: {total_bars}", fill=(255, 255, 255), font=font_small)
-    y_position += 20
-    
-    draw.text((30, y_position), f"Sections: {sections_count}", fill=(255, 255, 255), font=font_small)
-    y_position += 20
-    
-    draw.text((30, y_position), f"Predicted Genre: {genre_prediction}", fill=(255, 255, 255), font=font_small)
-    y_position += 30
+    y_position = draw_heading(y_position, "🎯 Summary")
+    y_position = draw_lines(y_position, [
+        f"Total Bars: {total_bars}",
+        f"Sections: {sections_count}",
+        f"Predicted Genre: {genre_prediction}",
+    ])
     
     # Suggestions
     suggestions = analysis_data.get('suggestions', [])
     if suggestions:
-        draw.text((30, y_position), "💡 Suggestions", fill=(255, 179, 71), font=font_medium)
-        y_position += 30
+        y_position = draw_heading(y_position, "💡 Suggestions")
         
+        # Wrap to the pixel width left between the margins after the bullet
+        max_width = width - 2 * IMAGE_MARGIN - font_small.getlength("• ")
+        
+        lines = []
         for suggestion in suggestions[:3]:  # Limit to 3 suggestions
             # Wrap text if too long
-            words = suggestion.split()
-            lines = []
-            current_line = ""
-            for word in words:
-                if len(current_line + word) < 60:
-                    current_line += word + " "
-                else:
-                    lines.append(current_line.strip())
-                    current_line = word + " "
-            if current_line:
-                lines.append(current_line.strip())
-            
-            for line in lines:
-                draw.text((30, y_position), f"• {line}", fill=(255, 255, 255), font=font_small)
-                y_position += 20
+            lines.extend(f"• {line}" for line in wrap_to_width(suggestion, font_small, max_width))
+        if lines:
+            draw_lines(y_position, lines)
     
     # Footer
     y_position = height - 50
-    draw.text((width//2, y_position), f"Generated on {datetime.now().strftime('%B %d, %Y')}", 
+    draw.text((width//2, y_position), f"Generated on {generated_timestamp(GENERATED_DATE_FORMAT)}", 
               fill=(178, 190, 195), font=font_small, anchor="mm")
     
     # Save to buffer
-    buffer = BytesIO()
+    buffer = SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
     image.save(buffer, format='PNG')
     buffer.seek(0)
     return buffer
@@ -666,31 +1342,7 @@ def get_sample_lyrics():
     API endpoint that returns sample lyrics for testing
     This helps users see how the app works without writing their own lyrics
     """
-    sample_lyrics = """[Verse 1]
-I'm in the studio, cooking up the heat
-Every bar I spit, got the crowd on their feet
-Metaphors so deep, they can't compete
-Wordplay so fresh, it's a lyrical treat
-
-[Chorus]
-Score my bars, let's see what you got
-AI analysis, give it all you've got
-From the cleverness to the radio spot
-This is hip-hop, and we're taking the top
-
-[Verse 2]
-Double entendres, they don't see it coming
-Punchlines so hard, got the audience humming
-Internal rhymes, the flow is stunning
-This is art, and I'm the one running
-
-[Bridge]
-From boom bap to trap, I can do it all
-Commercial appeal, but still keeping it raw
-This is the future, breaking every wall
-ScoreMyBars, we're answering the call"""
-    
-    return jsonify({'lyrics': sample_lyrics})
+    return static_json_response(SAMPLE_RESPONSE_BODY, SAMPLE_RESPONSE_ETAG)
 
 # =============================================================================
 # ERROR HANDLERS
@@ -706,6 +1358,22 @@ def internal_error(error):
     """Handle 500 errors (server errors)"""
     return render_template('500.html'), 500
 
+# =============================================================================
+# STARTUP
+# =============================================================================
+
+def warmup():
+    """
+    Build the cached lookups and responses up front
+    Runs at import time so every worker is ready before it serves its first request
+    """
+    ai_scorer.warmup()
+    genres_response_body()
+    for genre in ai_scorer.get_available_genres():
+        genre_response_fields(genre['key'])
+
+warmup()
+
 # =============================================================================
 # APPLICATION ENTRY POINT
 # =============================================================================
@@ -720,6 +1388,8 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5001))
     
     # Start the Flask development server
-    # debug=True enables auto-reload when code changes
+    # Production should run under gunicorn instead (gunicorn wsgi:app, see gunicorn.conf.py)
+    # FLASK_ENV=development enables debug mode, which auto-reloads when code changes
     # host='0.0.0.0' makes the server accessible from other devices on the network
-    app.run(debug=True, host='0.0.0.0', port=port) 
\ No newline at end of file
+    debug = os.getenv('FLASK_ENV') == 'development'
+    app.run(debug=debug, threaded=True, host='0.0.0.0', port=port) 
\ No newline at end of file
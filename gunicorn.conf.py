@@ -0,0 +1,27 @@
+# =============================================================================
+# ScoreMyBars - Gunicorn Configuration
+# =============================================================================
+# Gunicorn loads this file automatically when started from the project root.
+# Every setting can be overridden with an environment variable.
+
+import os
+import multiprocessing
+
+# Bind to the port Render (or any other host) gives us
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+
+# The usual (2 x cores) + 1 worker processes, so requests use every CPU core
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Threaded workers by default: most of a request is spent waiting on OpenAI,
+# so each worker process can serve several requests at once.
+# Set GUNICORN_WORKER_CLASS=gevent (requires the gevent package) to serve
+# many more concurrent requests per process while they wait on the network
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# Concurrent connections per gevent worker (ignored by gthread workers)
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 100))
+
+# Analyses with many AI calls can take a while
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
@@ -481,32 +481,86 @@ document.addEventListener('DOMContentLoaded', () => {
                 })
             });
 
-            const data = await response.json();
-            
-            if (data.success) {
-                // Create a download link and trigger the download
-                const link = document.createElement('a');
-                link.href = data.download_url;
-                link.download = data.filename;
-                document.body.appendChild(link);
-                link.click();
-                document.body.removeChild(link);
-                
-                console.log(`Export successful: ${data.filename}`);
-                
-                // Show success message
-                const exportType = data.filename.endsWith('.txt') ? 'Text file' : 
-                                 data.filename.endsWith('.pdf') ? 'PDF' : 'Image';
-                alert(`${exportType} export successful! File: ${data.filename}`);
-            } else {
+            if (!response.ok) {
+                const data = await response.json();
                 alert('Export failed: ' + data.error);
+                return;
             }
+
+            // The export is built in the background, poll until the file is ready
+            const { job_id } = await response.json();
+            const fileResponse = await waitForExport(job_id);
+
+            if (!fileResponse) {
+                alert('Export is taking too long. Please try again.');
+                return;
+            }
+
+            if (!fileResponse.ok) {
+                const data = await fileResponse.json();
+                alert('Export failed: ' + data.error);
+                return;
+            }
+
+            // The server streams the file back as a binary download
+            const blob = await fileResponse.blob();
+            const filename = getDownloadFilename(fileResponse, `scoremybars_analysis.${type === 'pdf' ? 'pdf' : 'png'}`);
+            const url = URL.createObjectURL(blob);
+
+            // Create a download link and trigger the download
+            const link = document.createElement('a');
+            link.href = url;
+            link.download = filename;
+            document.body.appendChild(link);
+            link.click();
+            document.body.removeChild(link);
+            URL.revokeObjectURL(url);
+            
+            console.log(`Export successful: ${filename}`);
+            
+            // Show success message
+            const exportType = filename.endsWith('.txt') ? 'Text file' : 
+                             filename.endsWith('.pdf') ? 'PDF' : 'Image';
+            alert(`${exportType} export successful! File: ${filename}`);
         } catch (error) {
             console.error('Export error:', error);
             alert('Export failed. Please try again.');
         }
     };
 
+    // How often to poll a background export, and how long to keep trying (about the server's own 30s export wait)
+    const EXPORT_POLL_INTERVAL_MS = 500;
+    const EXPORT_POLL_MAX_ATTEMPTS = 60;
+
+    /**
+     * Polls a background export job until the file is ready
+     * Gives up after EXPORT_POLL_MAX_ATTEMPTS, e.g. when the job was lost in a server restart
+     * @param {string} jobId - The job id returned by /export
+     * @returns {Promise<Response|null>} The response for the finished export (or the error response), null if it never finished
+     */
+    async function waitForExport(jobId) {
+        for (let attempt = 0; attempt < EXPORT_POLL_MAX_ATTEMPTS; attempt++) {
+            const response = await fetch(`/export/${jobId}`);
+            if (response.status !== 202) {
+                return response;
+            }
+            await new Promise(resolve => setTimeout(resolve, EXPORT_POLL_INTERVAL_MS));
+        }
+        return null;
+    }
+
+    /**
+     * Reads the download filename from the Content-Disposition header
+     * @param {Response} response - The fetch response for the exported file
+     * @param {string} fallback - Filename to use if the header is missing
+     * @returns {string} The filename to save as
+     */
+    function getDownloadFilename(response, fallback) {
+        const disposition = response.headers.get('Content-Disposition') || '';
+        const match = disposition.match(/filename="?([^";]+)"?/);
+        return match ? match[1] : fallback;
+    }
+
     /**
      * Shares results using the Web Share API or copies link to clipboard
      * This function is made available globally so it can be called from HTML buttons
@@ -521,30 +575,28 @@ document.addEventListener('DOMContentLoaded', () => {
 
             // First, generate an image of the results
             console.log('🖼️ Generating image for sharing...');
-            const response = await fetch('/export', {
+            const response = await fetch('/share', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
                 body: JSON.stringify({
-                    type: 'image',
                     analysis_data: currentAnalysisData
                 })
             });
 
-            const data = await response.json();
-            
-            if (!data.success) {
+            if (!response.ok) {
+                const data = await response.json();
                 alert('Failed to generate shareable image: ' + data.error);
                 return;
             }
 
-            // Convert base64 to blob
-            const base64Data = data.download_url.split(',')[1];
-            const blob = await fetch(`data:image/png;base64,${base64Data}`).then(res => res.blob());
+            // The server streams the PNG back as a binary download
+            const blob = await response.blob();
+            const filename = getDownloadFilename(response, 'scoremybars_share.png');
             
             // Create a file from the blob
-            const file = new File([blob], data.filename, { type: 'image/png' });
+            const file = new File([blob], filename, { type: 'image/png' });
 
             // Check if the browser supports the Web Share API
             if (navigator.share && navigator.canShare && navigator.canShare({ files: [file] })) {
@@ -558,11 +610,11 @@ document.addEventListener('DOMContentLoaded', () => {
                 } catch (shareError) {
                     console.log('Web Share API failed, falling back to download:', shareError);
                     // Fallback to download
-                    downloadImage(data.download_url, data.filename);
+                    downloadImage(blob, filename);
                 }
             } else {
                 // Fallback: download the image and show instructions
-                downloadImage(data.download_url, data.filename);
+                downloadImage(blob, filename);
                 alert('Image downloaded! You can now share it manually.');
             }
         } catch (error) {
@@ -572,17 +624,19 @@ document.addEventListener('DOMContentLoaded', () => {
     };
 
     /**
-     * Downloads an image from a data URL
-     * @param {string} dataUrl - The data URL of the image
+     * Downloads an image blob
+     * @param {Blob} blob - The image data
      * @param {string} filename - The filename to save as
      */
-    function downloadImage(dataUrl, filename) {
+    function downloadImage(blob, filename) {
+        const url = URL.createObjectURL(blob);
         const link = document.createElement('a');
-        link.href = dataUrl;
+        link.href = url;
         link.download = filename;
         document.body.appendChild(link);
         link.click();
         document.body.removeChild(link);
+        URL.revokeObjectURL(url);
         console.log(`✅ Image downloaded: ${filename}`);
     }
 
@@ -1,17 +1,296 @@
 import os
+import logging
 import openai
+import httpx
 import json
 import re
-from typing import List, Dict, Any
+import threading
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from types import MappingProxyType
+from functools import lru_cache
+from collections import Counter
+from operator import itemgetter
+from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
+from utils.response_cache import create_response_cache, create_semantic_cache
+
 load_dotenv()
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+# httpx can only speak HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = find_spec('h2') is not None
+
+# Matches every character that is not a lowercase vowel
+NON_VOWEL_PATTERN = re.compile(r'[^aeiou]+')
+
+@lru_cache(maxsize=8192)
+def _letters_only(word: str) -> str:
+    """Lowercase a word and drop everything but its letters, memoized since lyrics reuse the same words a lot"""
+    lowered = word.lower()
+    if lowered.isalpha():
+        # Most lyric words have no punctuation to drop
+        return lowered
+    return ''.join(c for c in lowered if c.isalpha())
+
+# Distinct section texts whose rule-based scores and highlights are kept
+RULE_BASED_CACHE_SIZE = 256
+
+# Decodes JSON embedded in AI responses, ignoring any text after it
+JSON_DECODER = json.JSONDecoder()
+
+# Parses whole JSON documents (AI replies in JSON mode, the Billboard data), with orjson when it is installed
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Whitespace and commas between the fields of a JSON object (or the values of an array)
+JSON_FIELD_SEPARATOR = re.compile(r'[\s,]*')
+
+# Keyword indicators used by the rule-based scoring, each one present adds its weight once
+SECTION_METAPHOR_INDICATORS = ('like', 'as', 'metaphor', 'simile', 'compare', 'imagine', 'picture')
+SECTION_CULTURAL_REFERENCES = ('money', 'fame', 'success', 'struggle', 'hustle', 'grind')
+SECTION_PUN_INDICATORS = ('play', 'word', 'double', 'meaning', 'flip', 'switch')
+SECTION_HOOK_INDICATORS = ('hook', 'catchy', 'repeat', 'chorus', 'memorable')
+LINE_METAPHOR_INDICATORS = ('like', 'as', 'metaphor', 'simile', 'compare', 'imagine', 'picture', 'seems', 'appears')
+LINE_CULTURAL_INDICATORS = ('money', 'fame', 'success', 'struggle', 'hustle', 'grind', 'dream', 'goal', 'life', 'death', 'love', 'hate')
+LINE_UNIQUE_INDICATORS = ('never', 'always', 'only', 'just', 'really', 'actually', 'truly', 'honestly')
+LINE_PUN_INDICATORS = ('play', 'word', 'double', 'meaning', 'flip', 'switch', 'turn', 'change')
+
+@lru_cache(maxsize=None)
+def _read_billboard_file(path: str) -> Dict[str, Any]:
+    """Parse the Billboard data file once per process, every AIScorer shares the result"""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+@lru_cache(maxsize=None)
+def _create_openai_client(api_key: str) -> openai.OpenAI:
+    """Create one OpenAI client per API key and process, so every AIScorer reuses its connection pool"""
+    # Keep connections to OpenAI open between requests so later calls skip the TCP and TLS handshakes,
+    # with HTTP/2 concurrent requests share those connections instead of each needing its own
+    timeout = float(os.getenv('OPENAI_TIMEOUT', 60))
+    http_client = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60),
+        timeout=httpx.Timeout(timeout, connect=5.0),
+        follow_redirects=True
+    )
+    return openai.OpenAI(api_key=api_key, timeout=timeout, http_client=http_client)
+
+def _extract_json(text: str, opening: str) -> Any:
+    """
+    Decode the JSON value that starts at the first opening bracket ('{' or '[') in text, None if there is none
+    Raises ValueError if the JSON there is malformed or incomplete
+    """
+    start = text.find(opening)
+    if start == -1:
+        return None
+    return JSON_DECODER.raw_decode(text, start)[0]
+
+def _read_json_fields(text: str, position: int) -> tuple:
+    """
+    Read the complete "key": value pairs of a JSON object that is still streaming in, starting at position
+    (just inside its opening brace, or where the previous call stopped)
+    Returns ([(key, value), ...], the position to continue from once more text arrives)
+    """
+    fields = []
+    while True:
+        start = JSON_FIELD_SEPARATOR.match(text, position).end()
+        try:
+            key, end = JSON_DECODER.raw_decode(text, start)
+            colon = JSON_FIELD_SEPARATOR.match(text, end).end()
+            if not isinstance(key, str) or text[colon:colon + 1] != ':':
+                break
+            value, end = JSON_DECODER.raw_decode(text, JSON_FIELD_SEPARATOR.match(text, colon + 1).end())
+        except ValueError:
+            # Not all there yet
+            break
+        if end >= len(text):
+            # A number at the very end may still be missing digits
+            break
+        fields.append((key, value))
+        position = end
+    return fields, position
+
+def _read_json_items(text: str, position: int) -> tuple:
+    """
+    Read the complete values of a JSON array that is still streaming in, starting at position
+    (just inside its opening bracket, or where the previous call stopped)
+    Returns ([value, ...], the position to continue from once more text arrives)
+    """
+    items = []
+    while True:
+        start = JSON_FIELD_SEPARATOR.match(text, position).end()
+        if text[start:start + 1] == ']':
+            break
+        try:
+            value, end = JSON_DECODER.raw_decode(text, start)
+        except ValueError:
+            # Not all there yet
+            break
+        if end >= len(text):
+            # A number at the very end may still be missing digits
+            break
+        items.append(value)
+        position = end
+    return items, position
+
+def _count_indicators(text: str, indicators: tuple) -> int:
+    """Count how many of the indicators appear somewhere in the text"""
+    return sum(1 for indicator in indicators if indicator in text)
+
+# Words that push the mood one way, matched anywhere in a word
+POSITIVE_MOOD_INDICATORS = ('happy', 'joy', 'success', 'win', 'love', 'good', 'great', 'amazing', 'wonderful')
+NEGATIVE_MOOD_INDICATORS = ('sad', 'pain', 'hate', 'anger', 'fear', 'death', 'violence', 'struggle')
+AGGRESSIVE_MOOD_INDICATORS = ('fight', 'war', 'attack', 'destroy', 'kill', 'violence', 'anger')
+
+@lru_cache(maxsize=8192)
+def _word_moods(word: str) -> tuple:
+    """Whether a word counts as (positive, negative, aggressive), memoized since songs share most of their words"""
+    return (
+        any(indicator in word for indicator in POSITIVE_MOOD_INDICATORS),
+        any(indicator in word for indicator in NEGATIVE_MOOD_INDICATORS),
+        any(indicator in word for indicator in AGGRESSIVE_MOOD_INDICATORS)
+    )
+
+# Sub-genres for each genre, as (default sub-genre, {sub-genre: indicators}).
+# A word counts towards a sub-genre when it contains one of its indicators
+SUB_GENRE_INDICATORS = {
+    'country': ('Mainstream Country', {
+        'Mainstream Country': ('country', 'rural', 'small town', 'pickup truck', 'dirt road', 'farm', 'ranch'),
+        'Outlaw Country': ('outlaw', 'rebel', 'prison', 'jail', 'criminal', 'law', 'justice'),
+        'Country Pop': ('pop', 'radio', 'hit', 'chart', 'mainstream', 'commercial'),
+        'Bluegrass': ('bluegrass', 'banjo', 'fiddle', 'mandolin', 'acoustic', 'traditional'),
+        'Country Rock': ('rock', 'guitar', 'electric', 'band', 'concert', 'stage')
+    }),
+    'hip_hop_rap': ('Mainstream Hip-Hop', {
+        'Drill': ('drill', 'opps', 'opposition', 'gang', 'violence', 'shoot', 'gun', 'dead', 'kill', 'blood', 'war'),
+        'Trap': ('trap', 'dope', 'drugs', 'money', 'cash', 'bands', 'racks', 'hundreds', 'thousands', 'million'),
+        'Conscious': ('conscious', 'awareness', 'social', 'justice', 'equality', 'freedom', 'rights', 'change', 'revolution'),
+        'Boom Bap': ('knowledge', 'wisdom', 'intellectual', 'philosophy', 'metaphor', 'simile', 'complex', 'sophisticated'),
+        'Alternative': ('alternative', 'experimental', 'unique', 'different', 'creative', 'artistic', 'abstract')
+    }),
+    'pop': ('Mainstream Pop', {
+        'Mainstream Pop': ('pop', 'radio', 'hit', 'chart', 'mainstream', 'commercial'),
+        'Pop Rock': ('rock', 'guitar', 'band', 'electric', 'concert'),
+        'Electropop': ('electronic', 'synth', 'digital', 'computer', 'electric'),
+        'Teen Pop': ('teen', 'young', 'school', 'crush', 'first love', 'innocent'),
+        'Adult Contemporary': ('adult', 'mature', 'sophisticated', 'romantic', 'love')
+    }),
+    'r_b': ('Contemporary R&B', {
+        'Contemporary R&B': ('r&b', 'soul', 'smooth', 'romantic', 'love'),
+        'Neo Soul': ('neo', 'soul', 'conscious', 'spiritual', 'jazz'),
+        'Alternative R&B': ('alternative', 'experimental', 'unique', 'different'),
+        'Hip-Hop Soul': ('hip-hop', 'rap', 'urban', 'street', 'gritty')
+    }),
+    'electronic_dance': ('Mainstream EDM', {
+        'Mainstream EDM': ('edm', 'electronic', 'dance', 'club', 'party'),
+        'House': ('house', 'groove', 'rhythm', 'beat', 'dance'),
+        'Dubstep': ('dubstep', 'bass', 'heavy', 'intense', 'drop'),
+        'Trance': ('trance', 'melodic', 'atmospheric', 'dreamy', 'ethereal')
+    }),
+    'rock': ('Mainstream Rock', {
+        'Mainstream Rock': ('rock', 'guitar', 'band', 'electric', 'concert'),
+        'Alternative Rock': ('alternative', 'indie', 'underground', 'experimental'),
+        'Hard Rock': ('hard', 'heavy', 'metal', 'aggressive', 'power'),
+        'Classic Rock': ('classic', 'vintage', 'retro', 'timeless', 'legendary')
+    })
+}
+
+# Target audience for each genre, as (default audience, ((sub-genre name, audience), ...)).
+# The first name found in the detected sub-genre wins, so order matters (e.g. 'Country Pop' before plain country)
+TARGET_AUDIENCES = {
+    'country': ("Mainstream country music fans, 25-50, with broad appeal", (
+        ('Outlaw', "Country music fans, typically 25-45, who appreciate traditional and rebellious themes"),
+        ('Pop', "Mainstream country and pop fans, 18-35, with crossover appeal"),
+        ('Bluegrass', "Traditional country and bluegrass enthusiasts, 30-60")
+    )),
+    'hip_hop_rap': ("General hip-hop audience, 16-40", (
+        ('Drill', "Young urban audience, typically 16-25"),
+        ('Trap', "Mainstream hip-hop fans, 18-35"),
+        ('Conscious', "Socially aware listeners, 20-40"),
+        ('Boom Bap', "Hip-hop purists and intellectuals, 25-45"),
+        ('Alternative', "Experimental music fans, 18-35")
+    )),
+    'pop': ("Mainstream pop audience, 15-40, with broad demographic appeal", (
+        ('Teen', "Teenage and young adult audience, 13-25"),
+        ('Adult Contemporary', "Adult listeners, 25-45, seeking sophisticated pop music"),
+        ('Electropop', "Young adult audience, 18-30, who enjoy electronic elements")
+    )),
+    'r_b': ("Contemporary R&B fans, 20-40, with romantic and emotional appeal", (
+        ('Neo Soul', "Soul music enthusiasts, 25-45, who appreciate conscious themes"),
+        ('Alternative', "Experimental R&B fans, 20-35, seeking unique sounds"),
+        ('Hip-Hop Soul', "Urban music fans, 18-35, who enjoy hip-hop and R&B fusion")
+    )),
+    'electronic_dance': ("EDM and dance music fans, 18-35, with festival and club appeal", (
+        ('House', "Club and dance music enthusiasts, 18-35"),
+        ('Dubstep', "Bass music fans, 18-30, who enjoy heavy electronic sounds"),
+        ('Trance', "Electronic music purists, 20-40, who appreciate melodic and atmospheric sounds")
+    )),
+    'rock': ("Mainstream rock fans, 20-45, with broad rock appeal", (
+        ('Alternative', "Indie and alternative rock fans, 20-40"),
+        ('Hard Rock', "Heavy rock and metal fans, 18-35"),
+        ('Classic Rock', "Rock music enthusiasts, 30-60, who appreciate timeless rock")
+    ))
+}
+
+# What each score measures, shared by the single and batch scoring prompts
+SCORING_CRITERIA = """Scoring Criteria (compare to Billboard #1 hits):
+1. Cleverness (0-100): Metaphors, double entendres, unique angles, cultural references
+2. Rhyme Density (0-100): End rhymes, internal rhymes, multi-syllabic rhymes, rhyme scheme complexity
+3. Wordplay (0-100): Puns, punchlines, literary devices, word manipulation techniques
+4. Radio Score (0-100): Hook potential, simplicity, replay value, commercial appeal"""
+
+# The four scores every section gets
+SCORE_KEYS = ('cleverness', 'rhyme_density', 'wordplay', 'radio_score')
+
+@lru_cache(maxsize=16384)
+def _word_sub_genres(selected_genre: str, word: str) -> tuple:
+    """Which of a genre's sub-genres a word counts towards (in SUB_GENRE_INDICATORS order), memoized per genre and word"""
+    return tuple(
+        any(indicator in word for indicator in indicators)
+        for indicators in SUB_GENRE_INDICATORS[selected_genre][1].values()
+    )
+
+# Words that suggest each theme, matched anywhere in the lyrics
+THEME_INDICATORS = {
+    'Success': ('success', 'win', 'victory', 'champion', 'king', 'boss', 'leader'),
+    'Struggle': ('struggle', 'hardship', 'pain', 'suffering', 'difficult', 'challenge'),
+    'Money': ('money', 'cash', 'wealth', 'rich', 'million', 'billion', 'dollar'),
+    'Love': ('love', 'heart', 'romance', 'relationship', 'girl', 'woman', 'baby'),
+    'Violence': ('violence', 'fight', 'war', 'gun', 'shoot', 'kill', 'blood'),
+    'Social Issues': ('social', 'justice', 'equality', 'rights', 'freedom', 'change'),
+    'Lifestyle': ('lifestyle', 'luxury', 'cars', 'jewelry', 'fashion', 'designer'),
+    'Motivation': ('motivation', 'inspire', 'dream', 'goal', 'ambition', 'aspire')
+}
+
+# Completion tokens allowed per section in a batch scoring request (four scores plus up to 5 highlights)
+BATCH_TOKENS_PER_SECTION = 250
+
+# Sections scored per request by score_sections_batch, longer songs are split into several requests sent at once
+SECTIONS_PER_REQUEST = 4
+
+# Songs described per request by generate_song_descriptions_batch, and the completion tokens allowed for each
+SONG_DESCRIPTIONS_PER_REQUEST = 8
+DESCRIPTION_TOKENS_PER_SONG = 400
+
+# Fields every song description has
+DESCRIPTION_FIELDS = ('description', 'sub_genre', 'themes', 'mood', 'target_audience', 'lyrical_style')
+
 class AIScorer:
     """AI-powered scoring engine for rap lyrics with Billboard Hot 100 comparison"""
     
     def __init__(self):
         self.client = None
+        # Scoring, highlights and song descriptions are short JSON extractions, a smaller model is much faster and cheaper for them
+        self.fast_model = os.getenv('SCORING_MODEL', 'gpt-4o-mini')
         api_key = os.getenv('OPENAI_API_KEY')
         if api_key:
             try:
@@ -22,10 +301,11 @@ class AIScorer:
                         del os.environ[var]
                 
                 # Try to create OpenAI client with minimal configuration
-                self.client = openai.OpenAI(api_key=api_key)
+                self.client = _create_openai_client(api_key)
                 
-                # Test the client with a simple call
-                self.client.models.list()
+                # Optionally test the client with a simple call, this costs a round trip to OpenAI on startup
+                if os.getenv('OPENAI_STARTUP_CHECK') == '1':
+                    self.client.models.list()
                 print("✅ OpenAI client initialized successfully")
             except Exception as e:
                 print(f"OpenAI client initialization failed: {e}")
@@ -36,6 +316,39 @@ class AIScorer:
         
         # Load Billboard Hot 100 data for comparison
         self.billboard_data = self._load_billboard_data()
+        self.available_genres = None
+        
+        # Display info for every genre, so lookups are a single dict access
+        self._genre_index = {
+            genre_key: self._build_genre_info(genre_key, genre_data)
+            for genre_key, genre_data in self.billboard_data.get('genres', {}).items()
+        }
+        
+        # Average Billboard scores for every genre with top songs, used to adjust the rule-based scores
+        self._billboard_average_index = {
+            genre_key: self._build_billboard_averages(genre_data['top_songs'])
+            for genre_key, genre_data in self.billboard_data.get('genres', {}).items()
+            if genre_data.get('top_songs')
+        }
+        
+        # Scoring prompt context for each genre, filled in by _billboard_context
+        self._billboard_context_index = {}
+        
+        # Cache AI responses so repeated lyrics don't pay for another OpenAI round trip
+        self.response_cache = create_response_cache()
+        
+        # Optionally reuse responses for near-duplicate sections too (e.g. a user tweaking one line)
+        self.semantic_cache = create_semantic_cache()
+        
+        # The rule-based scoring is pure, so unchanged sections (e.g. when a user edits one verse and rescores) are memoized
+        self._cached_rule_based_scores = lru_cache(maxsize=RULE_BASED_CACHE_SIZE)(self._rule_based_scores)
+        self._cached_rule_based_highlights = lru_cache(maxsize=RULE_BASED_CACHE_SIZE)(self._compute_rule_based_highlights)
+        self._cached_rule_based_song_description = lru_cache(maxsize=RULE_BASED_CACHE_SIZE)(self._compute_rule_based_song_description)
+        
+        # Analyses already run their AI calls on several threads at once,
+        # cap how many OpenAI requests this process has in flight so bursts don't hit rate limits
+        self._request_slots = threading.BoundedSemaphore(int(os.getenv('OPENAI_MAX_CONCURRENCY', 8)))
+        self.embedding_model = os.getenv('EMBEDDING_MODEL', 'text-embedding-3-small')
         
         # Scoring criteria
         self.scoring_criteria = {
@@ -60,8 +373,7 @@ class AIScorer:
     def _load_billboard_data(self) -> Dict[str, Any]:
         """Load Billboard Hot 100 data from JSON file"""
         try:
-            with open('data/billboard_hot100_data.json', 'r') as f:
-                return json.load(f)
+            return _read_billboard_file('data/billboard_hot100_data.json')
         except FileNotFoundError:
             print("Warning: Billboard data file not found, using fallback data")
             return self._get_fallback_billboard_data()
@@ -87,8 +399,97 @@ class AIScorer:
             }
         }
     
+    def _create_completion(self, **kwargs):
+        """Send a chat completion request, waiting for a free request slot first"""
+        with self._request_slots:
+            return self.client.chat.completions.create(**kwargs)
+    
+    def _stream_completion_deltas(self, **kwargs):
+        """
+        Stream a chat completion, yielding its text as it arrives
+        Holds a request slot until the generator finishes or is closed, closing it early stops the response
+        """
+        with self._request_slots:
+            stream = self.client.chat.completions.create(stream=True, **kwargs)
+            try:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                close = getattr(stream, 'close', None)
+                if close is not None:
+                    close()
+    
+    def _stream_completion_json(self, opening: str, **kwargs) -> str:
+        """
+        Stream a chat completion and stop reading it as soon as it contains a complete JSON value starting with opening
+        Returns the text received so far, so anything the model adds after the JSON is never waited for
+        """
+        text = ''
+        deltas = self._stream_completion_deltas(**kwargs)
+        try:
+            for delta in deltas:
+                text += delta
+                
+                # Only a closing bracket can complete the JSON value
+                if '}' in delta or ']' in delta:
+                    try:
+                        if _extract_json(text, opening) is not None:
+                            break
+                    except ValueError:
+                        pass
+        finally:
+            deltas.close()
+        return text.strip()
+    
+    def _create_embeddings(self, **kwargs):
+        """Send an embeddings request, waiting for a free request slot first"""
+        with self._request_slots:
+            return self.client.embeddings.create(**kwargs)
+    
+    def check_openai(self) -> bool:
+        """Test the OpenAI API key with a cheap request, only called on demand (e.g. from /health) so startup never waits on it"""
+        if not self.client:
+            return False
+        try:
+            with self._request_slots:
+                self.client.models.list()
+            return True
+        except Exception as e:
+            log.warning("OpenAI health check failed: %s", e)
+            return False
+    
+    def warmup(self) -> None:
+        """Precompute lookups from the Billboard data so the first request doesn't pay for them"""
+        # The data is only read after loading, make that explicit so it can be shared safely
+        if not isinstance(self.billboard_data, MappingProxyType):
+            self.billboard_data = MappingProxyType(self.billboard_data)
+        self.available_genres = tuple(self._build_available_genres())
+    
+    def get_genre_info(self, selected_genre: str) -> Dict[str, Any]:
+        """Get the display name, description and top 3 Billboard songs for a genre"""
+        genre_info = self._genre_index.get(selected_genre)
+        if genre_info is None:
+            # Unknown genre, same defaults as a genre without any data
+            genre_info = self._build_genre_info(selected_genre, {})
+        return genre_info
+    
+    def _build_genre_info(self, genre_key: str, genre_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the display info for one genre"""
+        return {
+            'name': genre_data.get('name', genre_key.replace('_', ' ').title()),
+            'description': genre_data.get('description', ''),
+            'top_songs': tuple(genre_data.get('top_songs', [])[:3])
+        }
+    
     def get_available_genres(self) -> List[Dict[str, str]]:
         """Get list of available genres for user selection"""
+        if self.available_genres is None:
+            return self._build_available_genres()
+        return list(self.available_genres)
+    
+    def _build_available_genres(self) -> List[Dict[str, str]]:
+        """Build the genre list from the Billboard data"""
         genres = []
         for genre_key, genre_data in self.billboard_data.get('genres', {}).items():
             genres.append({
@@ -113,12 +514,30 @@ class AIScorer:
             # Use Billboard comparison scoring
             return self._billboard_comparison_scoring(section, selected_genre)
         
+        cache_key = self.response_cache.make_key('score_section', self.fast_model, selected_genre, section['type'], section['bar_count'], section['text'])
+        cached_scores = self.response_cache.get(cache_key)
+        if cached_scores is not None:
+            return cached_scores
+        
+        # A section that only changed a word or two can reuse the scores of the earlier version
+        embedding = None
+        if self.semantic_cache is not None:
+            embedding = self._embed_text(section['text'])
+            if embedding is not None:
+                namespace = '\x00'.join(('score_section', self.fast_model, selected_genre, section['type']))
+                cached_scores = self.semantic_cache.get(namespace, embedding)
+                if cached_scores is not None:
+                    self.response_cache.set(cache_key, cached_scores)
+                    return cached_scores
+        
         try:
             # Create prompt for AI analysis with Billboard context
             prompt = self._create_billboard_scoring_prompt(section, selected_genre)
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
+            # Stream the reply so we can stop as soon as the scores JSON is complete
+            ai_response = self._stream_completion_json(
+                '{',
+                model=self.fast_model,
                 messages=[
                     {
                         "role": "system",
@@ -130,42 +549,43 @@ class AIScorer:
                     }
                 ],
                 temperature=0.3,
-                max_tokens=300
+                max_tokens=300,
+                response_format={"type": "json_object"}
             )
             
             # Parse AI response
-            ai_response = response.choices[0].message.content.strip()
             scores = self._parse_ai_scores(ai_response)
+            if scores is None:
+                # Unusable reply, don't cache it so the next request asks again
+                return self._billboard_comparison_scoring(section, selected_genre)
             
+            self.response_cache.set(cache_key, scores)
+            if embedding is not None:
+                self.semantic_cache.set(namespace, embedding, scores)
             return scores
             
+        except openai.RateLimitError:
+            # Rate limits reach the route so it can tell the client to back off
+            raise
         except Exception as e:
-            print(f"AI scoring failed: {e}")
+            log.warning("AI scoring failed: %s", e)
             return self._billboard_comparison_scoring(section, selected_genre)
     
     def _billboard_comparison_scoring(self, section: Dict[str, Any], selected_genre: str) -> Dict[str, float]:
         """Score lyrics by comparing to Billboard Hot 100 hits in the selected genre"""
-        text = section['text'].lower()
+        # Copy so callers can't change the memoized scores
+        return dict(self._cached_rule_based_scores(section['text'].lower(), selected_genre))
+    
+    def _rule_based_scores(self, text: str, selected_genre: str) -> Dict[str, float]:
+        """Score lowercased section text against the Billboard hits, memoized by _billboard_comparison_scoring"""
         lines = text.split('\n')
         words = text.split()
         
-        # Get genre-specific scoring weights
-        genre_weights = self.billboard_data.get('scoring_weights', {}).get(selected_genre, {
-            'cleverness': 0.25,
-            'rhyme_density': 0.25,
-            'wordplay': 0.25,
-            'radio_score': 0.25
-        })
-        
-        # Get top songs in this genre for comparison
-        genre_data = self.billboard_data.get('genres', {}).get(selected_genre, {})
-        top_songs = genre_data.get('top_songs', [])
-        
         # Calculate base scores
         base_scores = self._calculate_base_scores(text, lines, words)
         
         # Compare to Billboard hits and adjust scores
-        adjusted_scores = self._compare_to_billboard_hits(base_scores, top_songs, selected_genre)
+        adjusted_scores = self._compare_to_billboard_hits(base_scores, selected_genre)
         
         return adjusted_scores
     
@@ -173,47 +593,33 @@ class AIScorer:
         """Calculate base scores using rule-based analysis"""
         # Cleverness scoring
         cleverness_score = 50.0
-        metaphor_indicators = ['like', 'as', 'metaphor', 'simile', 'compare', 'imagine', 'picture']
-        cultural_references = ['money', 'fame', 'success', 'struggle', 'hustle', 'grind']
-        
-        for indicator in metaphor_indicators:
-            if indicator in text:
-                cleverness_score += 8
-        
-        for reference in cultural_references:
-            if reference in text:
-                cleverness_score += 5
+        cleverness_score += _count_indicators(text, SECTION_METAPHOR_INDICATORS) * 8
+        cleverness_score += _count_indicators(text, SECTION_CULTURAL_REFERENCES) * 5
         
         # Rhyme density scoring
         rhyme_score = 50.0
         if len(lines) > 1:
-            last_words = [line.split()[-1] if line.split() else '' for line in lines]
-            rhyme_count = 0
-            for i in range(len(last_words) - 1):
-                if last_words[i] and last_words[i+1]:
-                    if last_words[i][-2:] == last_words[i+1][-2:]:
-                        rhyme_count += 1
+            # Ending of each line's last word (only the last word is split off), then count neighbouring lines whose endings match
+            endings = [parts[-1][-2:] if (parts := line.rsplit(None, 1)) else '' for line in lines]
+            rhyme_count = sum(
+                1 for ending, next_ending in zip(endings, endings[1:])
+                if ending and next_ending and ending == next_ending
+            )
             
             rhyme_score = min(100, 50 + (rhyme_count * 12))
         
         # Wordplay scoring
         wordplay_score = 50.0
-        pun_indicators = ['play', 'word', 'double', 'meaning', 'flip', 'switch']
-        for indicator in pun_indicators:
-            if indicator in text:
-                wordplay_score += 10
+        wordplay_score += _count_indicators(text, SECTION_PUN_INDICATORS) * 10
         
         # Radio score
         radio_score = 50.0
-        hook_indicators = ['hook', 'catchy', 'repeat', 'chorus', 'memorable']
         simple_words = len([w for w in words if len(w) <= 4])
         if len(words) > 0:
             simplicity_ratio = simple_words / len(words)
             radio_score += simplicity_ratio * 30
         
-        for indicator in hook_indicators:
-            if indicator in text:
-                radio_score += 8
+        radio_score += _count_indicators(text, SECTION_HOOK_INDICATORS) * 8
         
         return {
             'cleverness': min(100, cleverness_score),
@@ -222,29 +628,14 @@ class AIScorer:
             'radio_score': min(100, radio_score)
         }
     
-    def _compare_to_billboard_hits(self, base_scores: Dict[str, float], top_songs: List[Dict], genre: str) -> Dict[str, float]:
+    def _compare_to_billboard_hits(self, base_scores: Dict[str, float], genre: str) -> Dict[str, float]:
         """Compare base scores to Billboard hits and adjust accordingly"""
-        if not top_songs:
+        # Average Billboard scores for this genre, computed once at startup
+        billboard_averages = self._billboard_average_index.get(genre)
+        if billboard_averages is None:
+            # No top songs to compare against
             return base_scores
         
-        # Calculate average Billboard scores for this genre
-        billboard_averages = {
-            'cleverness': 0,
-            'rhyme_density': 0,
-            'wordplay': 0,
-            'radio_score': 0
-        }
-        
-        for song in top_songs:
-            song_scores = song.get('scores', {})
-            for key in billboard_averages:
-                billboard_averages[key] += song_scores.get(key, 75)
-        
-        # Calculate averages
-        num_songs = len(top_songs)
-        for key in billboard_averages:
-            billboard_averages[key] = billboard_averages[key] / num_songs
-        
         # Adjust scores based on Billboard comparison
         adjusted_scores = {}
         for key in base_scores:
@@ -263,6 +654,26 @@ class AIScorer:
         
         return adjusted_scores
     
+    def _build_billboard_averages(self, top_songs: List[Dict]) -> Dict[str, float]:
+        """Average each score across a genre's top songs"""
+        billboard_averages = {
+            'cleverness': 0,
+            'rhyme_density': 0,
+            'wordplay': 0,
+            'radio_score': 0
+        }
+        
+        for song in top_songs:
+            song_scores = song.get('scores', {})
+            for key in billboard_averages:
+                billboard_averages[key] += song_scores.get(key, 75)
+        
+        num_songs = len(top_songs)
+        for key in billboard_averages:
+            billboard_averages[key] = billboard_averages[key] / num_songs
+        
+        return billboard_averages
+    
     def _create_billboard_scoring_prompt(self, section: Dict[str, Any], selected_genre: str) -> str:
         """Create a detailed prompt for AI scoring with Billboard context"""
         section_type = section['type']
@@ -270,33 +681,16 @@ class AIScorer:
         bar_count = section['bar_count']
         
         # Get genre information
-        genre_data = self.billboard_data.get('genres', {}).get(selected_genre, {})
-        genre_name = genre_data.get('name', selected_genre)
-        top_songs = genre_data.get('top_songs', [])
-        
-        # Create Billboard context
-        billboard_context = ""
-        if top_songs:
-            billboard_context = f"\n\nBillboard Hot 100 Context for {genre_name}:\n"
-            for song in top_songs[:3]:  # Show top 3 songs
-                billboard_context += f"- '{song['title']}' by {song['artist']} (Peak: #{song['peak_position']}, {song['weeks_at_1']} weeks at #1)\n"
-                billboard_context += f"  Scores: Cleverness {song['scores']['cleverness']}, Rhyme {song['scores']['rhyme_density']}, Wordplay {song['scores']['wordplay']}, Radio {song['scores']['radio_score']}\n"
+        genre_name, billboard_context = self._billboard_context(selected_genre)
         
+        # The instructions and Billboard context only depend on the genre and come first,
+        # so OpenAI's prompt caching can reuse them across sections and only the lyrics at the end are new
         prompt = f"""
-Analyze this {section_type} section and score it (0-100) compared to Billboard Hot 100 hits in the {genre_name} genre.
-
-Section Type: {section_type}
-Number of Bars: {bar_count}
-Lyrics:
-{text}
+Analyze the section below and score it (0-100) compared to Billboard Hot 100 hits in the {genre_name} genre.
 
 {billboard_context}
 
-Scoring Criteria (compare to Billboard #1 hits):
-1. Cleverness (0-100): Metaphors, double entendres, unique angles, cultural references
-2. Rhyme Density (0-100): End rhymes, internal rhymes, multi-syllabic rhymes, rhyme scheme complexity
-3. Wordplay (0-100): Puns, punchlines, literary devices, word manipulation techniques
-4. Radio Score (0-100): Hook potential, simplicity, replay value, commercial appeal
+{SCORING_CRITERIA}
 
 Return only a JSON object like this:
 {{
@@ -306,65 +700,148 @@ Return only a JSON object like this:
     "radio_score": 65,
     "billboard_comparison": "This compares favorably to [song name] in terms of [specific aspect]"
 }}
+
+Section Type: {section_type}
+Number of Bars: {bar_count}
+Lyrics:
+{text}
 """
         return prompt
     
-    def _parse_ai_scores(self, ai_response: str) -> Dict[str, float]:
-        """Parse AI response to extract scores"""
+    def _billboard_context(self, selected_genre: str) -> tuple:
+        """Get the genre name and the Billboard top songs context used in scoring prompts"""
+        context = self._billboard_context_index.get(selected_genre)
+        if context is None:
+            # Built the first time a genre is scored, then every prompt for it reuses the same text
+            context = self._build_billboard_context(selected_genre)
+            self._billboard_context_index[selected_genre] = context
+        return context
+    
+    def _build_billboard_context(self, selected_genre: str) -> tuple:
+        """Build the genre name and Billboard top songs context for one genre"""
+        genre_data = self.billboard_data.get('genres', {}).get(selected_genre, {})
+        genre_name = genre_data.get('name', selected_genre)
+        top_songs = genre_data.get('top_songs', [])
+        
+        # Create Billboard context
+        billboard_context = ""
+        if top_songs:
+            billboard_context = f"\n\nBillboard Hot 100 Context for {genre_name}:\n"
+            for song in top_songs[:3]:  # Show top 3 songs
+                billboard_context += f"- '{song['title']}' by {song['artist']} (Peak: #{song['peak_position']}, {song['weeks_at_1']} weeks at #1)\n"
+                billboard_context += f"  Scores: Cleverness {song['scores']['cleverness']}, Rhyme {song['scores']['rhyme_density']}, Wordplay {song['scores']['wordplay']}, Radio {song['scores']['radio_score']}\n"
+        
+        return genre_name, billboard_context
+    
+    def _parse_ai_scores(self, ai_response: str) -> Optional[Dict[str, float]]:
+        """Parse AI response to extract scores, returns None if the reply has no usable scores"""
         try:
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
-            if json_match:
-                scores = json.loads(json_match.group())
-                
-                # Ensure all required scores are present and within range
-                required_scores = ['cleverness', 'rhyme_density', 'wordplay', 'radio_score']
-                for score_type in required_scores:
-                    if score_type not in scores:
-                        scores[score_type] = 50.0
-                    else:
-                        scores[score_type] = max(0, min(100, float(scores[score_type])))
-                
-                return scores
-            else:
+            scores = self._load_json_reply(ai_response, '{')
+            if not isinstance(scores, dict):
                 raise ValueError("No JSON found in AI response")
+            return self._normalize_scores(scores)
                 
         except Exception as e:
-            print(f"Failed to parse AI scores: {e}")
-            return {
-                'cleverness': 50.0,
-                'rhyme_density': 50.0,
-                'wordplay': 50.0,
-                'radio_score': 50.0
-            }
+            log.warning("Failed to parse AI scores: %s", e)
+            return None
     
-    def get_highlights(self, text: str) -> List[str]:
-        """Get highlights and standout lines from the text based on cleverness, wordplay, and rhyme density"""
-        if not self.client:
-            # Use rule-based highlighting when AI is not available
-            return self._rule_based_highlights(text)
+    def _normalize_scores(self, scores: Dict[str, Any]) -> Dict[str, Any]:
+        """Ensure all required scores are present and within range"""
+        for score_type in SCORE_KEYS:
+            if score_type not in scores:
+                scores[score_type] = 50.0
+            else:
+                scores[score_type] = max(0, min(100, float(scores[score_type])))
+        
+        return scores
+    
+    def score_sections_batch(self, sections: List[Dict[str, Any]], selected_genre: str = 'hip_hop_rap') -> tuple:
+        """
+        Score every section and pick its highlights with as few AI requests as possible
         
+        Args:
+            sections (List): Section data with text and metadata
+            selected_genre (str): User-selected genre for comparison
+            
+        Returns:
+            tuple: (one {'scores': ..., 'highlights': ...} dict per section in the same order,
+                    True if any section fell back to rule-based scoring because its AI request failed)
+        """
+        if not self.client:
+            return [self._rule_based_section_result(section, selected_genre) for section in sections], False
+        
+        # Sections already scored by score_section/get_highlights (or an earlier batch) come from the cache
+        results = [None] * len(sections)
+        pending = []
+        for i, section in enumerate(sections):
+            cached_scores = self.response_cache.get(self.response_cache.make_key('score_section', self.fast_model, selected_genre, section['type'], section['bar_count'], section['text']))
+            cached_highlights = self.response_cache.get(self.response_cache.make_key('get_highlights', self.fast_model, section['text']))
+            if cached_scores is not None and cached_highlights is not None:
+                results[i] = {'scores': cached_scores, 'highlights': cached_highlights}
+            else:
+                pending.append(i)
+        
+        if not pending:
+            return results, False
+        
+        # Then look for near-duplicate sections in the semantic cache
+        embeddings = {}
+        if self.semantic_cache is not None:
+            embeddings = self._embed_sections([sections[i] for i in pending], pending)
+            still_pending = []
+            for i in pending:
+                cached = None
+                if i in embeddings:
+                    cached = self.semantic_cache.get(self._semantic_namespace(sections[i], selected_genre), embeddings[i])
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    still_pending.append(i)
+            pending = still_pending
+            
+            if not pending:
+                return results, False
+        
+        # A request writes its reply one token at a time, so long songs are split into chunks sent side by side
+        chunks = [pending[start:start + SECTIONS_PER_REQUEST] for start in range(0, len(pending), SECTIONS_PER_REQUEST)]
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                chunk_entries = list(executor.map(lambda chunk: self._score_section_chunk([sections[i] for i in chunk], selected_genre), chunks))
+        else:
+            chunk_entries = [self._score_section_chunk([sections[i] for i in chunk], selected_genre) for chunk in chunks]
+        
+        fell_back = False
+        for chunk, entries in zip(chunks, chunk_entries):
+            for number, i in enumerate(chunk, 1):
+                section = sections[i]
+                entry = entries.get(number)
+                if entry is None:
+                    # Missing or unusable entry, only this section falls back to rule-based scoring
+                    log.warning("No usable AI scores for section %s, using rule-based scoring", i + 1)
+                    results[i] = self._rule_based_section_result(section, selected_genre)
+                    fell_back = True
+                    continue
+                
+                scores, highlights = entry
+                self.response_cache.set(self.response_cache.make_key('score_section', self.fast_model, selected_genre, section['type'], section['bar_count'], section['text']), scores)
+                self.response_cache.set(self.response_cache.make_key('get_highlights', self.fast_model, section['text']), highlights)
+                results[i] = {'scores': scores, 'highlights': highlights}
+                if i in embeddings:
+                    self.semantic_cache.set(self._semantic_namespace(section, selected_genre), embeddings[i], results[i])
+        
+        return results, fell_back
+    
+    def _score_section_chunk(self, sections: List[Dict[str, Any]], selected_genre: str) -> Dict[int, tuple]:
+        """Score up to SECTIONS_PER_REQUEST sections with one AI request, returns {section number: (scores, highlights)}"""
         try:
-            prompt = f"""
-Analyze these lyrics and identify 3-5 standout lines or phrases that demonstrate:
-- Clever wordplay and metaphors
-- Strong rhyme patterns
-- Effective punchlines
-- Memorable hooks
-- Cultural references or clever angles
-
-Lyrics:
-{text}
-
-Return only a JSON array of strings with the highlights.
-"""
+            prompt = self._create_batch_scoring_prompt(sections, selected_genre)
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
+            response = self._create_completion(
+                model=self.fast_model,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a music lyric analyst. Identify standout lines and return them as a JSON array."
+                        "content": "You are an expert music analyst comparing lyrics to Billboard Hot 100 hits. For every section you are given, provide scores (0-100) for cleverness, rhyme_density, wordplay, and radio_score compared to actual Billboard #1 hits in the specified genre, and pick its standout lines. Respond with a JSON object."
                     },
                     {
                         "role": "user",
@@ -372,19 +849,324 @@ Return only a JSON array of strings with the highlights.
                     }
                 ],
                 temperature=0.3,
-                max_tokens=300
+                max_tokens=BATCH_TOKENS_PER_SECTION * len(sections),
+                response_format={"type": "json_object"}
             )
             
             ai_response = response.choices[0].message.content.strip()
+            return self._index_batch_entries(_json_loads(ai_response)['sections'])
+            
+        except openai.RateLimitError:
+            raise
+        except Exception as e:
+            log.warning("AI batch scoring failed: %s", e)
+            return {}
+    
+    def _index_batch_entries(self, entries: List[Any]) -> Dict[int, tuple]:
+        """
+        Map the entries of a batch scoring response to their section numbers, as {number: (scores, highlights)}
+        Entries are matched by their idx (or their position when it is missing), malformed entries are skipped
+        """
+        indexed = {}
+        for position, entry in enumerate(entries, 1):
+            try:
+                number = int(entry.pop('idx', position))
+                highlights = entry.pop('highlights', None)
+                if not isinstance(highlights, list) or not highlights:
+                    highlights = ["No highlights found"]
+                indexed[number] = (self._normalize_scores(entry), highlights[:5])
+            except (AttributeError, TypeError, ValueError) as e:
+                log.warning("Skipping malformed AI batch entry %s: %s", position, e)
+        return indexed
+    
+    def _rule_based_section_result(self, section: Dict[str, Any], selected_genre: str) -> Dict[str, Any]:
+        """Score a section and pick its highlights without AI"""
+        return {
+            'scores': self._billboard_comparison_scoring(section, selected_genre),
+            'highlights': self._rule_based_highlights(section['text'])
+        }
+    
+    def submit_offline_scoring(self, sections: List[Dict[str, Any]], selected_genre: str = 'hip_hop_rap') -> str:
+        """
+        Queue sections for scoring through the OpenAI Batch API, for bulk jobs like rescoring a whole catalog
+        Batch requests cost half as much but can take up to 24 hours, poll fetch_offline_scoring for the results
+        
+        Args:
+            sections (List): Section data with text and metadata, optionally with an 'id' to match up the results
+            selected_genre (str): User-selected genre for comparison
+            
+        Returns:
+            str: The batch job id
+        """
+        if not self.client:
+            raise RuntimeError("Offline scoring needs an OpenAI API key")
+        
+        # One chat completion request per section, in the JSONL format the Batch API expects
+        requests = []
+        for i, section in enumerate(sections):
+            requests.append(json.dumps({
+                'custom_id': str(section.get('id', i)),
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': {
+                    'model': self.fast_model,
+                    'messages': [
+                        {
+                            'role': 'system',
+                            'content': 'You are an expert music analyst comparing lyrics to Billboard Hot 100 hits. Analyze the given lyrics and provide scores (0-100) for four categories: cleverness, rhyme_density, wordplay, and radio_score. Compare to actual Billboard #1 hits in the specified genre.'
+                        },
+                        {
+                            'role': 'user',
+                            'content': self._create_billboard_scoring_prompt(section, selected_genre)
+                        }
+                    ],
+                    'temperature': 0.3,
+                    'max_tokens': 300,
+                    'response_format': {'type': 'json_object'}
+                }
+            }))
+        
+        input_file = self.client.files.create(
+            file=('scoremybars_batch.jsonl', '\n'.join(requests).encode()),
+            purpose='batch'
+        )
+        
+        # The pinned SDK predates client.batches, so the endpoint is called directly
+        batch = self.client.post('/batches', cast_to=object, body={
+            'input_file_id': input_file.id,
+            'endpoint': '/v1/chat/completions',
+            'completion_window': '24h'
+        })
+        return batch['id']
+    
+    def fetch_offline_scoring(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Get the results of a submit_offline_scoring job
+        
+        Returns:
+            Dict: {'status': ..., 'scores': {section id: scores}}, scores is None until the batch has completed
+        """
+        if not self.client:
+            raise RuntimeError("Offline scoring needs an OpenAI API key")
+        
+        batch = self.client.get(f'/batches/{batch_id}', cast_to=object)
+        if batch['status'] != 'completed':
+            return {'status': batch['status'], 'scores': None}
+        
+        scores = {}
+        if batch.get('output_file_id'):
+            output = self.client.files.content(batch['output_file_id']).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                result = _json_loads(line)
+                try:
+                    ai_response = result['response']['body']['choices'][0]['message']['content']
+                except (KeyError, IndexError, TypeError):
+                    # This request failed inside the batch
+                    log.warning("Offline scoring request %s failed: %s", result.get('custom_id'), result.get('error'))
+                    continue
+                section_scores = self._parse_ai_scores(ai_response)
+                if section_scores is not None:
+                    scores[result['custom_id']] = section_scores
+        
+        return {'status': batch['status'], 'scores': scores}
+    
+    def _embed_sections(self, sections: List[Dict[str, Any]], indexes: List[int]) -> Dict[int, List[float]]:
+        """Embed section texts with one request, returns {index: embedding} (empty if the request fails)"""
+        try:
+            response = self._create_embeddings(
+                model=self.embedding_model,
+                input=[section['text'] for section in sections]
+            )
+            return {i: item.embedding for i, item in zip(indexes, response.data)}
+        except Exception as e:
+            log.warning("Embedding sections failed: %s", e)
+            return {}
+    
+    def _embed_text(self, text: str) -> Optional[List[float]]:
+        """Embed a single text, returns None if the request fails"""
+        try:
+            response = self._create_embeddings(model=self.embedding_model, input=text)
+            return response.data[0].embedding
+        except Exception as e:
+            log.warning("Embedding text failed: %s", e)
+            return None
+    
+    def _semantic_namespace(self, section: Dict[str, Any], selected_genre: str) -> str:
+        """Only sections scored by the same model for the same genre and section type can be reused"""
+        return '\x00'.join(('score_sections_batch', self.fast_model, selected_genre, section['type']))
+    
+    def _create_batch_scoring_prompt(self, sections: List[Dict[str, Any]], selected_genre: str) -> str:
+        """Create one prompt that scores several sections, sharing the Billboard context between them"""
+        genre_name, billboard_context = self._billboard_context(selected_genre)
+        
+        section_texts = "\n\n".join(
+            f"Section {i} ({section['type']}, {section['bar_count']} bars):\n{section['text']}"
+            for i, section in enumerate(sections, 1)
+        )
+        
+        # Shared instructions first and the sections last, so the prompt prefix is the same for every batch in a genre
+        prompt = f"""
+Analyze each of the sections below and score them (0-100) compared to Billboard Hot 100 hits in the {genre_name} genre.
+
+{billboard_context}
+
+{SCORING_CRITERIA}
+
+Also pick 3-5 standout lines or phrases from each section (clever wordplay, strong rhymes, punchlines, memorable hooks).
+
+Return only a JSON object with one entry per section, in the same order, with idx set to the section number:
+{{
+    "sections": [
+        {{
+            "idx": 1,
+            "cleverness": 85,
+            "rhyme_density": 78,
+            "wordplay": 92,
+            "radio_score": 65,
+            "highlights": ["standout line", "another standout line"]
+        }}
+    ]
+}}
+
+{section_texts}
+"""
+        return prompt
+    
+    def get_highlights(self, text: str) -> List[str]:
+        """Get highlights and standout lines from the text based on cleverness, wordplay, and rhyme density"""
+        if not self.client:
+            # Use rule-based highlighting when AI is not available
+            return self._rule_based_highlights(text)
+        
+        cache_key = self.response_cache.make_key('get_highlights', self.fast_model, text)
+        cached_highlights = self.response_cache.get(cache_key)
+        if cached_highlights is not None:
+            return cached_highlights
+        
+        try:
+            # Stream the reply so we can stop as soon as the highlights object is complete
+            ai_response = self._stream_completion_json('{', **self._highlights_request(text))
+            
             highlights = self._parse_highlights(ai_response)
+            if highlights is None:
+                # Unusable reply, don't cache it so the next request asks again
+                return self._rule_based_highlights(text)
+            
+            self.response_cache.set(cache_key, highlights)
             return highlights
             
+        except openai.RateLimitError:
+            raise
         except Exception as e:
-            print(f"Failed to get highlights: {e}")
+            log.warning("Failed to get highlights: %s", e)
             return self._rule_based_highlights(text)
     
+    def get_highlights_stream(self, text: str):
+        """
+        Get the highlights one at a time as the AI writes them, so a page can show the first standout line right away
+        
+        Yields:
+            str: Each highlight (at most 5), in the same order get_highlights returns them
+        """
+        if not self.client:
+            yield from self._rule_based_highlights(text)
+            return
+        
+        cache_key = self.response_cache.make_key('get_highlights', self.fast_model, text)
+        cached_highlights = self.response_cache.get(cache_key)
+        if cached_highlights is not None:
+            yield from cached_highlights
+            return
+        
+        highlights = []
+        ai_response, position = '', None
+        complete = False
+        deltas = self._stream_completion_deltas(**self._highlights_request(text))
+        try:
+            for delta in deltas:
+                ai_response += delta
+                if position is None:
+                    # Highlights start after the array's opening bracket
+                    opening = ai_response.find('[')
+                    if opening == -1:
+                        continue
+                    position = opening + 1
+                
+                items, position = _read_json_items(ai_response, position)
+                for highlight in items[:5 - len(highlights)]:
+                    highlights.append(highlight)
+                    yield highlight
+                
+                end = JSON_FIELD_SEPARATOR.match(ai_response, position).end()
+                if len(highlights) == 5 or ai_response[end:end + 1] == ']':
+                    complete = True
+                    break
+        except Exception as e:
+            # A partial list is never cached, the next request asks again
+            log.warning("Failed to stream highlights: %s", e)
+            if not highlights:
+                yield from self._rule_based_highlights(text)
+            return
+        finally:
+            deltas.close()
+        
+        if not complete:
+            # The reply ended before the highlights array did (or had none at all)
+            log.warning("Highlights stream ended without a complete highlights list")
+            if not highlights:
+                yield from self._rule_based_highlights(text)
+            return
+        self.response_cache.set(cache_key, highlights)
+    
+    def _highlights_request(self, text: str) -> Dict[str, Any]:
+        """Build the chat completion arguments that pick a section's standout lines"""
+        prompt = f"""
+Analyze these lyrics and identify 3-5 standout lines or phrases that demonstrate:
+- Clever wordplay and metaphors
+- Strong rhyme patterns
+- Effective punchlines
+- Memorable hooks
+- Cultural references or clever angles
+
+Return only a JSON object with the highlights as an array of strings:
+{{"highlights": ["standout line", "another standout line"]}}
+
+Lyrics:
+{text}
+"""
+        
+        return {
+            "model": self.fast_model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a music lyric analyst. Identify standout lines and return them as a JSON object."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3,
+            "max_tokens": 300,
+            "response_format": {"type": "json_object"}
+        }
+    
     def _rule_based_highlights(self, text: str) -> List[str]:
         """Generate highlights using rule-based analysis based on cleverness, wordplay, and rhyme density"""
+        # Copy so callers can't change the memoized highlights
+        return list(self._cached_rule_based_highlights(text))
+    
+    def invalidate_rule_based_caches(self) -> None:
+        """Forget memoized rule-based scores, highlights and song descriptions, needed if the Billboard data is ever reloaded"""
+        self._cached_rule_based_scores.cache_clear()
+        self._cached_rule_based_highlights.cache_clear()
+        self._cached_rule_based_song_description.cache_clear()
+    
+    def _compute_rule_based_highlights(self, text: str) -> List[str]:
+        """Pick and describe the standout lines, memoized by _rule_based_highlights"""
         lines = [line.strip() for line in text.split('\n') if line.strip()]
         if not lines:
             return ["No lyrics found to analyze"]
@@ -405,11 +1187,15 @@ Return only a JSON array of strings with the highlights.
         # Score each line based on different criteria
         line_scores = []
         
+        # Lowercase and split every line once, all three scorers and the neighbouring lines' rhyme checks share them
+        lower_lines = [line.lower() for line in filtered_lines]
+        line_words = [line.split() for line in filtered_lines]
+        
         for i, line in enumerate(filtered_lines):
             # Calculate scores for this line
-            cleverness_score = self._score_line_cleverness(line)
-            wordplay_score = self._score_line_wordplay(line)
-            rhyme_score = self._score_line_rhyme(line, filtered_lines, i)
+            cleverness_score = self._score_line_cleverness(line, lower_lines[i], line_words[i])
+            wordplay_score = self._score_line_wordplay(line, lower_lines[i], line_words[i])
+            rhyme_score = self._score_line_rhyme(line, filtered_lines, i, line_words)
             
             # Combined score (weighted average)
             combined_score = (cleverness_score * 0.4) + (wordplay_score * 0.4) + (rhyme_score * 0.2)
@@ -423,12 +1209,12 @@ Return only a JSON array of strings with the highlights.
                 'combined': combined_score
             })
         
-        # Sort by combined score and get top highlights
-        line_scores.sort(key=lambda x: x['combined'], reverse=True)
+        # Get the top 5 lines by combined score, without sorting every line (ties keep their lyric order)
+        top_lines = heapq.nlargest(5, line_scores, key=itemgetter('combined'))
         
         # Generate highlight descriptions
         highlights = []
-        for i, score_data in enumerate(line_scores[:5]):  # Top 5 lines
+        for i, score_data in enumerate(top_lines):
             line = score_data['line']
             cleverness = score_data['cleverness']
             wordplay = score_data['wordplay']
@@ -473,50 +1259,42 @@ Return only a JSON array of strings with the highlights.
         
         return highlights[:5]  # Limit to 5 highlights
     
-    def _score_line_cleverness(self, line: str) -> float:
+    def _score_line_cleverness(self, line: str, line_lower: str = None, words: List[str] = None) -> float:
         """Score a line for cleverness (metaphors, cultural references, unique angles)"""
-        line_lower = line.lower()
+        if line_lower is None:
+            line_lower = line.lower()
         score = 50.0  # Base score
         
         # Metaphor indicators
-        metaphor_indicators = ['like', 'as', 'metaphor', 'simile', 'compare', 'imagine', 'picture', 'seems', 'appears']
-        for indicator in metaphor_indicators:
-            if indicator in line_lower:
-                score += 10
+        score += _count_indicators(line_lower, LINE_METAPHOR_INDICATORS) * 10
         
         # Cultural references
-        cultural_indicators = ['money', 'fame', 'success', 'struggle', 'hustle', 'grind', 'dream', 'goal', 'life', 'death', 'love', 'hate']
-        for indicator in cultural_indicators:
-            if indicator in line_lower:
-                score += 5
+        score += _count_indicators(line_lower, LINE_CULTURAL_INDICATORS) * 5
         
         # Unique perspective indicators
-        unique_indicators = ['never', 'always', 'only', 'just', 'really', 'actually', 'truly', 'honestly']
-        for indicator in unique_indicators:
-            if indicator in line_lower:
-                score += 3
+        score += _count_indicators(line_lower, LINE_UNIQUE_INDICATORS) * 3
         
         # Word complexity (longer, more sophisticated words)
-        words = line.split()
+        if words is None:
+            words = line.split()
         avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
         if avg_word_length > 6:
             score += 15
         
         return min(100, score)
     
-    def _score_line_wordplay(self, line: str) -> float:
+    def _score_line_wordplay(self, line: str, line_lower: str = None, words: List[str] = None) -> float:
         """Score a line for wordplay (puns, double meanings, clever word usage)"""
-        line_lower = line.lower()
+        if line_lower is None:
+            line_lower = line.lower()
         score = 50.0  # Base score
         
         # Pun indicators
-        pun_indicators = ['play', 'word', 'double', 'meaning', 'flip', 'switch', 'turn', 'change']
-        for indicator in pun_indicators:
-            if indicator in line_lower:
-                score += 12
+        score += _count_indicators(line_lower, LINE_PUN_INDICATORS) * 12
         
         # Alliteration (repeated consonant sounds)
-        words = line.split()
+        if words is None:
+            words = line.split()
         if len(words) > 2:
             alliteration_count = 0
             for i in range(len(words) - 1):
@@ -525,11 +1303,13 @@ Return only a JSON array of strings with the highlights.
                         alliteration_count += 1
             score += alliteration_count * 8
         
+        # Lowercase each word once for the assonance and repetition checks
+        lower_words = [word.lower() for word in words]
+        
         # Assonance (repeated vowel sounds)
-        vowels = 'aeiou'
         vowel_patterns = []
-        for word in words:
-            word_vowels = ''.join(c for c in word.lower() if c in vowels)
+        for word in lower_words:
+            word_vowels = NON_VOWEL_PATTERN.sub('', word)
             if len(word_vowels) > 1:
                 vowel_patterns.append(word_vowels)
         
@@ -539,9 +1319,7 @@ Return only a JSON array of strings with the highlights.
                     score += 10
         
         # Repetition for emphasis
-        word_counts = {}
-        for word in words:
-            word_counts[word.lower()] = word_counts.get(word.lower(), 0) + 1
+        word_counts = Counter(lower_words)
         
         for word, count in word_counts.items():
             if count > 1 and len(word) > 2:
@@ -549,29 +1327,30 @@ Return only a JSON array of strings with the highlights.
         
         return min(100, score)
     
-    def _score_line_rhyme(self, line: str, all_lines: List[str], line_index: int) -> float:
-        """Score a line for rhyme quality (end rhymes, internal rhymes)"""
+    def _score_line_rhyme(self, line: str, all_lines: List[str], line_index: int, all_words: List[List[str]] = None) -> float:
+        """Score a line for rhyme quality (end rhymes, internal rhymes), all_words optionally holds every line already split"""
+        if all_words is None:
+            all_words = [other_line.split() for other_line in all_lines]
+        words = all_words[line_index]
+        
         score = 50.0  # Base score
         
         # End rhyme with adjacent lines
         if line_index > 0:
-            prev_line = all_lines[line_index - 1]
-            if self._lines_rhyme(line, prev_line):
+            if self._last_words_rhyme(words, all_words[line_index - 1]):
                 score += 20
         
         if line_index < len(all_lines) - 1:
-            next_line = all_lines[line_index + 1]
-            if self._lines_rhyme(line, next_line):
+            if self._last_words_rhyme(words, all_words[line_index + 1]):
                 score += 20
         
         # Internal rhyme within the line
-        words = line.split()
         if len(words) > 3:
-            internal_rhymes = 0
-            for i in range(len(words) - 1):
-                for j in range(i + 1, len(words)):
-                    if self._words_rhyme(words[i], words[j]):
-                        internal_rhymes += 1
+            # Words rhyme when their endings match, so every pair within a group of matching endings rhymes
+            ending_counts = Counter(
+                clean[-2:] for clean in map(_letters_only, words) if len(clean) >= 2
+            )
+            internal_rhymes = sum(count * (count - 1) // 2 for count in ending_counts.values())
             score += internal_rhymes * 8
         
         # Multi-syllabic rhyme detection
@@ -584,9 +1363,10 @@ Return only a JSON array of strings with the highlights.
     
     def _lines_rhyme(self, line1: str, line2: str) -> bool:
         """Check if two lines rhyme at the end"""
-        words1 = line1.split()
-        words2 = line2.split()
-        
+        return self._last_words_rhyme(line1.split(), line2.split())
+    
+    def _last_words_rhyme(self, words1: List[str], words2: List[str]) -> bool:
+        """Check if two already split lines rhyme at the end"""
         if not words1 or not words2:
             return False
         
@@ -595,50 +1375,50 @@ Return only a JSON array of strings with the highlights.
     def _words_rhyme(self, word1: str, word2: str) -> bool:
         """Check if two words rhyme"""
         # Simple rhyme detection based on ending sounds
-        word1_clean = ''.join(c for c in word1.lower() if c.isalpha())
-        word2_clean = ''.join(c for c in word2.lower() if c.isalpha())
+        word1_clean = _letters_only(word1)
+        word2_clean = _letters_only(word2)
         
         if len(word1_clean) < 2 or len(word2_clean) < 2:
             return False
         
-        # Check last 2-3 characters for rhyme
-        for length in [3, 2]:
-            if len(word1_clean) >= length and len(word2_clean) >= length:
-                if word1_clean[-length:] == word2_clean[-length:]:
-                    return True
-        
-        return False
+        # Matching last 2 characters (a 3 character match always includes them)
+        return word1_clean[-2:] == word2_clean[-2:]
     
     def _is_multi_syllabic_rhyme(self, word1: str, word2: str) -> bool:
         """Check if two words form a multi-syllabic rhyme"""
         # Simple multi-syllabic detection (words with similar ending patterns)
-        word1_clean = ''.join(c for c in word1.lower() if c.isalpha())
-        word2_clean = ''.join(c for c in word2.lower() if c.isalpha())
+        word1_clean = _letters_only(word1)
+        word2_clean = _letters_only(word2)
         
         if len(word1_clean) < 4 or len(word2_clean) < 4:
             return False
         
-        # Check for longer rhyming patterns (4+ characters)
-        for length in [4, 5]:
-            if len(word1_clean) >= length and len(word2_clean) >= length:
-                if word1_clean[-length:] == word2_clean[-length:]:
-                    return True
-        
-        return False
+        # Check for longer rhyming patterns (4+ characters, a 5 character match always includes the last 4)
+        return word1_clean[-4:] == word2_clean[-4:]
     
-    def _parse_highlights(self, ai_response: str) -> List[str]:
-        """Parse AI response to extract highlights"""
+    def _load_json_reply(self, ai_response: str, opening: str) -> Any:
+        """
+        Load the JSON in an AI response, returns None if there is none
+        JSON mode replies are parsed directly, text around the JSON is only skipped as a fallback
+        """
         try:
-            # Extract JSON array from response
-            json_match = re.search(r'\[.*\]', ai_response, re.DOTALL)
-            if json_match:
-                highlights = json.loads(json_match.group())
-                if isinstance(highlights, list):
-                    return highlights[:5]  # Limit to 5 highlights
-            return ["No highlights found"]
+            return _json_loads(ai_response)
+        except ValueError:
+            return _extract_json(ai_response, opening)
+    
+    def _parse_highlights(self, ai_response: str) -> Optional[List[str]]:
+        """Parse AI response to extract highlights, returns None if the reply has no highlights list"""
+        try:
+            highlights = self._load_json_reply(ai_response, '[')
+            if isinstance(highlights, dict):
+                # JSON mode replies wrap the array in an object
+                highlights = highlights.get('highlights')
+            if isinstance(highlights, list):
+                return highlights[:5]  # Limit to 5 highlights
+            raise ValueError("No highlights list found in AI response")
         except Exception as e:
-            print(f"Failed to parse highlights: {e}")
-            return ["Error parsing highlights"]
+            log.warning("Failed to parse highlights: %s", e)
+            return None
     
     def predict_genre(self, analysis_results: List[Dict[str, Any]], selected_genre: str = "hip_hop_rap") -> str:
         """
@@ -652,10 +1432,7 @@ Return only a JSON array of strings with the highlights.
             str: The selected genre (not a prediction)
         """
         # Get genre information for proper display
-        genre_data = self.billboard_data.get('genres', {}).get(selected_genre, {})
-        genre_name = genre_data.get('name', selected_genre.replace('_', ' ').title())
-        
-        return genre_name
+        return self.get_genre_info(selected_genre)['name']
     
     def predict_popularity(self, overall_scores: Dict[str, float]) -> Dict[str, Any]:
         """Predict popularity potential based on scores"""
@@ -714,7 +1491,7 @@ Return only a JSON array of strings with the highlights.
         
         return suggestions[:5]  # Limit to 5 suggestions
     
-    def generate_song_description(self, lyrics: str, song_title: str = "", artist_name: str = "", selected_genre: str = "hip_hop_rap") -> Dict[str, Any]:
+    def generate_song_description(self, lyrics: str, song_title: str = "", artist_name: str = "", selected_genre: str = "hip_hop_rap") -> tuple:
         """
         Generate AI-powered song description and sub-genre prediction
         
@@ -725,25 +1502,118 @@ Return only a JSON array of strings with the highlights.
             selected_genre (str): User-selected genre for analysis
             
         Returns:
-            Dict: Song description, sub-genre prediction, and themes
+            tuple: (song description, sub-genre prediction and themes,
+                    True if it fell back to rule-based analysis because the AI request failed)
         """
         if not self.client:
             # Use rule-based analysis when AI is not available
-            return self._rule_based_song_description(lyrics, song_title, artist_name, selected_genre)
+            return self._rule_based_song_description(lyrics, song_title, artist_name, selected_genre), False
+        
+        cache_key = self._song_description_key(lyrics, song_title, artist_name, selected_genre)
+        cached_description = self.response_cache.get(cache_key)
+        if cached_description is not None:
+            return cached_description, False
+        
+        # Lightly edited lyrics can reuse the description of a near-identical earlier song
+        embedding = None
+        if self.semantic_cache is not None:
+            embedding = self._embed_text(lyrics)
+            if embedding is not None:
+                namespace = '\x00'.join(('generate_song_description', self.fast_model, selected_genre, song_title, artist_name))
+                cached_description = self.semantic_cache.get(namespace, embedding)
+                if cached_description is not None:
+                    self.response_cache.set(cache_key, cached_description)
+                    return cached_description, False
         
         try:
-            # Get genre information for context
-            genre_data = self.billboard_data.get('genres', {}).get(selected_genre, {})
-            genre_name = genre_data.get('name', selected_genre.replace('_', ' ').title())
+            # Stream the reply so reading stops as soon as the JSON object is complete
+            ai_response = self._stream_completion_json(
+                '{',
+                **self._song_description_request(lyrics, song_title, artist_name, selected_genre)
+            )
+            description = self._parse_song_description(ai_response)
+            if description is None:
+                # Unusable reply, don't cache it so the next request asks again
+                return self._rule_based_song_description(lyrics, song_title, artist_name, selected_genre), True
             
-            prompt = f"""
-Analyze these lyrics and provide a comprehensive song description and sub-genre prediction within the {genre_name} genre.
-
-Song Title: {song_title or "Untitled"}
-Artist: {artist_name or "Unknown Artist"}
-Selected Genre: {genre_name}
-Lyrics:
-{lyrics}
+            self.response_cache.set(cache_key, description)
+            if embedding is not None:
+                self.semantic_cache.set(namespace, embedding, description)
+            return description, False
+            
+        except openai.RateLimitError:
+            raise
+        except Exception as e:
+            log.warning("AI song description failed: %s", e)
+            return self._rule_based_song_description(lyrics, song_title, artist_name, selected_genre), True
+    
+    def generate_song_description_stream(self, lyrics: str, song_title: str = "", artist_name: str = "", selected_genre: str = "hip_hop_rap"):
+        """
+        Generate the song description field by field, so a page can show the description
+        while the themes, mood and the rest are still being written
+        
+        Args:
+            lyrics (str): The song lyrics
+            song_title (str): Song title (optional)
+            artist_name (str): Artist name (optional)
+            selected_genre (str): User-selected genre for analysis
+            
+        Yields:
+            tuple: (field, value) for every field of the description, each field exactly once
+        """
+        if not self.client:
+            yield from self._rule_based_song_description(lyrics, song_title, artist_name, selected_genre).items()
+            return
+        
+        cache_key = self._song_description_key(lyrics, song_title, artist_name, selected_genre)
+        cached_description = self.response_cache.get(cache_key)
+        if cached_description is not None:
+            yield from cached_description.items()
+            return
+        
+        description = {}
+        text, position = '', None
+        deltas = self._stream_completion_deltas(**self._song_description_request(lyrics, song_title, artist_name, selected_genre))
+        try:
+            for delta in deltas:
+                text += delta
+                if position is None:
+                    # Fields start after the opening brace
+                    opening = text.find('{')
+                    if opening == -1:
+                        continue
+                    position = opening + 1
+                
+                fields, position = _read_json_fields(text, position)
+                for field, value in fields:
+                    if field in DESCRIPTION_FIELDS and field not in description:
+                        description[field] = value
+                        yield field, value
+                
+                if len(description) == len(DESCRIPTION_FIELDS):
+                    break
+        except Exception as e:
+            log.warning("AI song description stream failed: %s", e)
+        finally:
+            deltas.close()
+        
+        if len(description) == len(DESCRIPTION_FIELDS):
+            self.response_cache.set(cache_key, description)
+            return
+        
+        # Fill in whatever the AI didn't get to, from the rule-based analysis if the AI gave nothing at all
+        fallback = self._rule_based_song_description(lyrics, song_title, artist_name, selected_genre) if not description else {}
+        for field in DESCRIPTION_FIELDS:
+            if field not in description:
+                yield field, fallback.get(field, "Not specified")
+    
+    def _song_description_request(self, lyrics: str, song_title: str, artist_name: str, selected_genre: str) -> Dict[str, Any]:
+        """Build the chat completion arguments that describe one song"""
+        # Get genre information for context
+        genre_name = self.get_genre_info(selected_genre)['name']
+        
+        prompt = f"""
+Analyze the lyrics below and provide a comprehensive song description and sub-genre prediction within the {genre_name} genre.
 
 Please provide:
 1. A detailed song description (2-3 sentences) that correctly identifies this as a {genre_name} song
@@ -763,14 +1633,136 @@ Return only a JSON object like this:
     "target_audience": "target audience description",
     "lyrical_style": "description of lyrical approach"
 }}
+
+Song Title: {song_title or "Untitled"}
+Artist: {artist_name or "Unknown Artist"}
+Selected Genre: {genre_name}
+Lyrics:
+{lyrics}
 """
+        
+        return {
+            "model": self.fast_model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": f"You are an expert music analyst specializing in {genre_name} music. Analyze lyrics to determine sub-genres within {genre_name}, themes, and provide detailed descriptions. Always identify the song as {genre_name}, not hip-hop or rap unless the selected genre is actually hip-hop/rap. Respond with a JSON object."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3,
+            "max_tokens": 400,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def generate_song_descriptions_batch(self, items: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Describe several songs at once (playlists, bulk imports), packing up to
+        SONG_DESCRIPTIONS_PER_REQUEST songs into each AI request
+        
+        Args:
+            items (List): One dict per song with 'lyrics' and optional 'song_title', 'artist_name' and 'selected_genre'
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
+        Returns:
+            List: One song description per item, in the same order
+        """
+        songs = [
+            (item['lyrics'], item.get('song_title', ''), item.get('artist_name', ''), item.get('selected_genre', 'hip_hop_rap'))
+            for item in items
+        ]
+        
+        if not self.client:
+            return [self._rule_based_song_description(*song) for song in songs]
+        
+        # Songs described before come from the cache
+        results = [None] * len(songs)
+        pending = []
+        for i, (lyrics, song_title, artist_name, selected_genre) in enumerate(songs):
+            cached_description = self.response_cache.get(self._song_description_key(lyrics, song_title, artist_name, selected_genre))
+            if cached_description is not None:
+                results[i] = cached_description
+            else:
+                pending.append(i)
+        
+        if len(pending) == 1:
+            # Nothing to batch, the single song path also checks the semantic cache
+            results[pending[0]] = self.generate_song_description(*songs[pending[0]])[0]
+            return results
+        
+        chunks = [pending[start:start + SONG_DESCRIPTIONS_PER_REQUEST] for start in range(0, len(pending), SONG_DESCRIPTIONS_PER_REQUEST)]
+        if len(chunks) > 1:
+            # Send the requests side by side, the request slots still cap how many run at once
+            with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                chunk_descriptions = list(executor.map(lambda chunk: self._describe_songs([songs[i] for i in chunk]), chunks))
+        else:
+            chunk_descriptions = [self._describe_songs([songs[i] for i in chunk]) for chunk in chunks]
+        
+        for chunk, descriptions in zip(chunks, chunk_descriptions):
+            for number, i in enumerate(chunk, 1):
+                description = descriptions.get(number)
+                if description is None:
+                    # Missing entry, only this song falls back to rule-based analysis
+                    log.warning("No usable AI description for song %s, using rule-based analysis", i + 1)
+                    results[i] = self._rule_based_song_description(*songs[i])
+                    continue
+                
+                self.response_cache.set(self._song_description_key(*songs[i]), description)
+                results[i] = description
+        
+        return results
+    
+    def _describe_songs(self, songs: List[tuple]) -> Dict[int, Dict[str, Any]]:
+        """Describe up to SONG_DESCRIPTIONS_PER_REQUEST songs with one AI request, returns {song number: description}"""
+        song_texts = "\n\n".join(
+            f"""Song {number}
+Song Title: {song_title or "Untitled"}
+Artist: {artist_name or "Unknown Artist"}
+Selected Genre: {self.get_genre_info(selected_genre)['name']}
+Lyrics:
+{lyrics}"""
+            for number, (lyrics, song_title, artist_name, selected_genre) in enumerate(songs, 1)
+        )
+        
+        prompt = f"""
+Analyze each of the songs below and provide a comprehensive song description and sub-genre prediction within its selected genre.
+
+For every song, please provide:
+1. A detailed song description (2-3 sentences) that correctly identifies it as a song of its selected genre
+2. Sub-genre prediction within its selected genre (e.g., for country: Mainstream Country, Outlaw Country, Country Pop, etc.)
+3. Key themes and topics
+4. Mood and tone analysis
+5. Target audience
+
+IMPORTANT: Each song should be described as a song of its selected genre, not hip-hop or rap, unless its selected genre is actually hip-hop/rap.
+
+Return only a JSON object like this, with one result per song:
+{{
+    "results": [
+        {{
+            "index": 1,
+            "description": "A detailed description of the song's content and style as a song of its selected genre",
+            "sub_genre": "predicted sub-genre within the selected genre",
+            "themes": ["theme1", "theme2", "theme3"],
+            "mood": "mood description",
+            "target_audience": "target audience description",
+            "lyrical_style": "description of lyrical approach"
+        }}
+    ]
+}}
+
+{song_texts}
+"""
+        
+        try:
+            response = self._create_completion(
+                model=self.fast_model,
                 messages=[
                     {
                         "role": "system",
-                        "content": f"You are an expert music analyst specializing in {genre_name} music. Analyze lyrics to determine sub-genres within {genre_name}, themes, and provide detailed descriptions. Always identify the song as {genre_name}, not hip-hop or rap unless the selected genre is actually hip-hop/rap."
+                        "content": "You are an expert music analyst. Analyze lyrics to determine sub-genres within each song's selected genre, themes, and provide detailed descriptions. Always identify each song as its selected genre, not hip-hop or rap unless the selected genre is actually hip-hop/rap. Respond with a JSON object."
                     },
                     {
                         "role": "user",
@@ -778,36 +1770,64 @@ Return only a JSON object like this:
                     }
                 ],
                 temperature=0.3,
-                max_tokens=400
+                max_tokens=DESCRIPTION_TOKENS_PER_SONG * len(songs),
+                response_format={"type": "json_object"}
             )
             
             ai_response = response.choices[0].message.content.strip()
-            return self._parse_song_description(ai_response)
+            entries = self._load_json_reply(ai_response, '{')['results']
+            if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+                raise ValueError("AI response results are not a list of objects")
             
+        except openai.RateLimitError:
+            raise
         except Exception as e:
-            print(f"AI song description failed: {e}")
-            return self._rule_based_song_description(lyrics, song_title, artist_name, selected_genre)
+            log.warning("AI batch song description failed: %s", e)
+            return {}
+        
+        descriptions = {}
+        for position, entry in enumerate(entries, 1):
+            try:
+                number = int(entry.pop('index', position))
+                for field in DESCRIPTION_FIELDS:
+                    entry.setdefault(field, "Not specified")
+                descriptions[number] = entry
+            except (AttributeError, TypeError, ValueError) as e:
+                log.warning("Skipping malformed AI song description %s: %s", position, e)
+        return descriptions
+    
+    def _song_description_key(self, lyrics: str, song_title: str, artist_name: str, selected_genre: str) -> str:
+        """Response cache key for a song description, surrounding whitespace doesn't change the description"""
+        return self.response_cache.make_key('generate_song_description', self.fast_model, selected_genre, song_title, artist_name, lyrics.strip())
     
     def _rule_based_song_description(self, lyrics: str, song_title: str, artist_name: str, selected_genre: str) -> Dict[str, Any]:
         """Generate song description using rule-based analysis"""
+        # Copy (including the themes list) so callers can't change the memoized description
+        description = dict(self._cached_rule_based_song_description(lyrics, song_title, artist_name, selected_genre))
+        description['themes'] = list(description['themes'])
+        return description
+    
+    def _compute_rule_based_song_description(self, lyrics: str, song_title: str, artist_name: str, selected_genre: str) -> Dict[str, Any]:
+        """Describe the song from its lyrics, memoized by _rule_based_song_description"""
         lyrics_lower = lyrics.lower()
         words = lyrics_lower.split()
+        # Counted once and shared by the detectors below
+        word_counts = Counter(words)
         
         # Get genre information
-        genre_data = self.billboard_data.get('genres', {}).get(selected_genre, {})
-        genre_name = genre_data.get('name', selected_genre.replace('_', ' ').title())
+        genre_name = self.get_genre_info(selected_genre)['name']
         
         # Sub-genre detection based on selected genre and lyrical content
-        sub_genre = self._detect_sub_genre(lyrics_lower, words, selected_genre)
+        sub_genre = self._detect_sub_genre(lyrics_lower, words, selected_genre, word_counts)
         
         # Theme detection
         themes = self._detect_themes(lyrics_lower, words)
         
         # Mood detection
-        mood = self._detect_mood(lyrics_lower, words)
+        mood = self._detect_mood(lyrics_lower, words, word_counts)
         
         # Generate description
-        description = self._generate_description(lyrics, song_title, artist_name, sub_genre, themes, genre_name)
+        description = self._generate_description(lyrics, song_title, artist_name, sub_genre, themes, genre_name, len(words))
         
         return {
             "description": description,
@@ -815,149 +1835,58 @@ Return only a JSON object like this:
             "themes": themes,
             "mood": mood,
             "target_audience": self._determine_target_audience(sub_genre, themes, selected_genre),
-            "lyrical_style": self._analyze_lyrical_style(lyrics_lower, words)
+            "lyrical_style": self._analyze_lyrical_style(lyrics_lower, words, word_counts)
         }
     
-    def _detect_sub_genre(self, lyrics: str, words: List[str], selected_genre: str) -> str:
+    def _detect_sub_genre(self, lyrics: str, words: List[str], selected_genre: str, word_counts: Counter = None) -> str:
         """Detect sub-genre based on selected genre and lyrical content"""
-        
-        # Genre-specific sub-genre detection
-        if selected_genre == "country":
-            # Country sub-genres
-            country_indicators = {
-                'Mainstream Country': ['country', 'rural', 'small town', 'pickup truck', 'dirt road', 'farm', 'ranch'],
-                'Outlaw Country': ['outlaw', 'rebel', 'prison', 'jail', 'criminal', 'law', 'justice'],
-                'Country Pop': ['pop', 'radio', 'hit', 'chart', 'mainstream', 'commercial'],
-                'Bluegrass': ['bluegrass', 'banjo', 'fiddle', 'mandolin', 'acoustic', 'traditional'],
-                'Country Rock': ['rock', 'guitar', 'electric', 'band', 'concert', 'stage']
-            }
-        elif selected_genre == "hip_hop_rap":
-            # Hip-hop sub-genres (existing logic)
-            drill_indicators = ['drill', 'opps', 'opposition', 'gang', 'violence', 'shoot', 'gun', 'dead', 'kill', 'blood', 'war']
-            drill_count = sum(1 for word in words if any(indicator in word for indicator in drill_indicators))
-            
-            trap_indicators = ['trap', 'dope', 'drugs', 'money', 'cash', 'bands', 'racks', 'hundreds', 'thousands', 'million']
-            trap_count = sum(1 for word in words if any(indicator in word for indicator in trap_indicators))
-            
-            conscious_indicators = ['conscious', 'awareness', 'social', 'justice', 'equality', 'freedom', 'rights', 'change', 'revolution']
-            conscious_count = sum(1 for word in words if any(indicator in word for indicator in conscious_indicators))
-            
-            boom_bap_indicators = ['knowledge', 'wisdom', 'intellectual', 'philosophy', 'metaphor', 'simile', 'complex', 'sophisticated']
-            boom_bap_count = sum(1 for word in words if any(indicator in word for indicator in boom_bap_indicators))
-            
-            alternative_indicators = ['alternative', 'experimental', 'unique', 'different', 'creative', 'artistic', 'abstract']
-            alternative_count = sum(1 for word in words if any(indicator in word for indicator in alternative_indicators))
-            
-            counts = {
-                'Drill': drill_count,
-                'Trap': trap_count,
-                'Conscious': conscious_count,
-                'Boom Bap': boom_bap_count,
-                'Alternative': alternative_count
-            }
-            
-            max_genre = max(counts, key=counts.get)
-            return max_genre if counts[max_genre] > 0 else 'Mainstream Hip-Hop'
-            
-        elif selected_genre == "pop":
-            # Pop sub-genres
-            pop_indicators = {
-                'Mainstream Pop': ['pop', 'radio', 'hit', 'chart', 'mainstream', 'commercial'],
-                'Pop Rock': ['rock', 'guitar', 'band', 'electric', 'concert'],
-                'Electropop': ['electronic', 'synth', 'digital', 'computer', 'electric'],
-                'Teen Pop': ['teen', 'young', 'school', 'crush', 'first love', 'innocent'],
-                'Adult Contemporary': ['adult', 'mature', 'sophisticated', 'romantic', 'love']
-            }
-        elif selected_genre == "r_b":
-            # R&B sub-genres
-            r_b_indicators = {
-                'Contemporary R&B': ['r&b', 'soul', 'smooth', 'romantic', 'love'],
-                'Neo Soul': ['neo', 'soul', 'conscious', 'spiritual', 'jazz'],
-                'Alternative R&B': ['alternative', 'experimental', 'unique', 'different'],
-                'Hip-Hop Soul': ['hip-hop', 'rap', 'urban', 'street', 'gritty']
-            }
-        elif selected_genre == "electronic_dance":
-            # EDM sub-genres
-            edm_indicators = {
-                'Mainstream EDM': ['edm', 'electronic', 'dance', 'club', 'party'],
-                'House': ['house', 'groove', 'rhythm', 'beat', 'dance'],
-                'Dubstep': ['dubstep', 'bass', 'heavy', 'intense', 'drop'],
-                'Trance': ['trance', 'melodic', 'atmospheric', 'dreamy', 'ethereal']
-            }
-        elif selected_genre == "rock":
-            # Rock sub-genres
-            rock_indicators = {
-                'Mainstream Rock': ['rock', 'guitar', 'band', 'electric', 'concert'],
-                'Alternative Rock': ['alternative', 'indie', 'underground', 'experimental'],
-                'Hard Rock': ['hard', 'heavy', 'metal', 'aggressive', 'power'],
-                'Classic Rock': ['classic', 'vintage', 'retro', 'timeless', 'legendary']
-            }
-        else:
+        genre_sub_genres = SUB_GENRE_INDICATORS.get(selected_genre)
+        if genre_sub_genres is None:
             # Default to mainstream for unknown genres
             return f"Mainstream {selected_genre.replace('_', ' ').title()}"
         
-        # For country and other genres, use the appropriate indicators
-        if selected_genre == "country":
-            counts = {}
-            for sub_genre, indicators in country_indicators.items():
-                counts[sub_genre] = sum(1 for word in words if any(indicator in word for indicator in indicators))
-            max_genre = max(counts, key=counts.get)
-            return max_genre if counts[max_genre] > 0 else 'Mainstream Country'
-        elif selected_genre == "pop":
-            counts = {}
-            for sub_genre, indicators in pop_indicators.items():
-                counts[sub_genre] = sum(1 for word in words if any(indicator in word for indicator in indicators))
-            max_genre = max(counts, key=counts.get)
-            return max_genre if counts[max_genre] > 0 else 'Mainstream Pop'
-        elif selected_genre == "r_b":
-            counts = {}
-            for sub_genre, indicators in r_b_indicators.items():
-                counts[sub_genre] = sum(1 for word in words if any(indicator in word for indicator in indicators))
-            max_genre = max(counts, key=counts.get)
-            return max_genre if counts[max_genre] > 0 else 'Contemporary R&B'
-        elif selected_genre == "electronic_dance":
-            counts = {}
-            for sub_genre, indicators in edm_indicators.items():
-                counts[sub_genre] = sum(1 for word in words if any(indicator in word for indicator in indicators))
-            max_genre = max(counts, key=counts.get)
-            return max_genre if counts[max_genre] > 0 else 'Mainstream EDM'
-        elif selected_genre == "rock":
-            counts = {}
-            for sub_genre, indicators in rock_indicators.items():
-                counts[sub_genre] = sum(1 for word in words if any(indicator in word for indicator in indicators))
-            max_genre = max(counts, key=counts.get)
-            return max_genre if counts[max_genre] > 0 else 'Mainstream Rock'
+        default_sub_genre, sub_genre_indicators = genre_sub_genres
+        
+        # Lyrics repeat words a lot, so classify each distinct word once and weight it by how often it appears
+        if word_counts is None:
+            word_counts = Counter(words)
+        totals = [0] * len(sub_genre_indicators)
+        for word, count in word_counts.items():
+            for position, matches in enumerate(_word_sub_genres(selected_genre, word)):
+                if matches:
+                    totals[position] += count
+        counts = dict(zip(sub_genre_indicators, totals))
+        
+        max_genre = max(counts, key=counts.get)
+        return max_genre if counts[max_genre] > 0 else default_sub_genre
     
     def _detect_themes(self, lyrics: str, words: List[str]) -> List[str]:
         """Detect themes in the lyrics"""
         themes = []
         
-        theme_indicators = {
-            'Success': ['success', 'win', 'victory', 'champion', 'king', 'boss', 'leader'],
-            'Struggle': ['struggle', 'hardship', 'pain', 'suffering', 'difficult', 'challenge'],
-            'Money': ['money', 'cash', 'wealth', 'rich', 'million', 'billion', 'dollar'],
-            'Love': ['love', 'heart', 'romance', 'relationship', 'girl', 'woman', 'baby'],
-            'Violence': ['violence', 'fight', 'war', 'gun', 'shoot', 'kill', 'blood'],
-            'Social Issues': ['social', 'justice', 'equality', 'rights', 'freedom', 'change'],
-            'Lifestyle': ['lifestyle', 'luxury', 'cars', 'jewelry', 'fashion', 'designer'],
-            'Motivation': ['motivation', 'inspire', 'dream', 'goal', 'ambition', 'aspire']
-        }
-        
-        for theme, indicators in theme_indicators.items():
+        for theme, indicators in THEME_INDICATORS.items():
             if any(indicator in lyrics for indicator in indicators):
                 themes.append(theme)
+                if len(themes) == 5:
+                    # Limit to top 5 themes, no need to check the rest
+                    break
         
-        return themes[:5]  # Limit to top 5 themes
+        return themes
     
-    def _detect_mood(self, lyrics: str, words: List[str]) -> str:
+    def _detect_mood(self, lyrics: str, words: List[str], word_counts: Counter = None) -> str:
         """Detect the mood of the lyrics"""
-        positive_words = ['happy', 'joy', 'success', 'win', 'love', 'good', 'great', 'amazing', 'wonderful']
-        negative_words = ['sad', 'pain', 'hate', 'anger', 'fear', 'death', 'violence', 'struggle']
-        aggressive_words = ['fight', 'war', 'attack', 'destroy', 'kill', 'violence', 'anger']
-        
-        positive_count = sum(1 for word in words if any(pos in word for pos in positive_words))
-        negative_count = sum(1 for word in words if any(neg in word for neg in negative_words))
-        aggressive_count = sum(1 for word in words if any(agg in word for agg in aggressive_words))
+        # Classify each distinct word once, weighted by how often it appears
+        if word_counts is None:
+            word_counts = Counter(words)
+        positive_count = negative_count = aggressive_count = 0
+        for word, count in word_counts.items():
+            positive, negative, aggressive = _word_moods(word)
+            if positive:
+                positive_count += count
+            if negative:
+                negative_count += count
+            if aggressive:
+                aggressive_count += count
         
         if aggressive_count > positive_count and aggressive_count > negative_count:
             return "Aggressive and confrontational"
@@ -968,10 +1897,11 @@ Return only a JSON object like this:
         else:
             return "Balanced and reflective"
     
-    def _generate_description(self, lyrics: str, song_title: str, artist_name: str, sub_genre: str, themes: List[str], genre_name: str) -> str:
+    def _generate_description(self, lyrics: str, song_title: str, artist_name: str, sub_genre: str, themes: List[str], genre_name: str, word_count: int = None) -> str:
         """Generate a song description"""
-        line_count = len(lyrics.split('\n'))
-        word_count = len(lyrics.split())
+        line_count = lyrics.count('\n') + 1
+        if word_count is None:
+            word_count = len(lyrics.split())
         
         artist_text = f" by {artist_name}" if artist_name else ""
         title_text = song_title if song_title else "This track"
@@ -1003,77 +1933,20 @@ Return only a JSON object like this:
     def _determine_target_audience(self, sub_genre: str, themes: List[str], selected_genre: str) -> str:
         """Determine target audience based on sub-genre, themes, and selected genre"""
         
-        # Genre-specific target audience determination
-        if selected_genre == "country":
-            if "Outlaw" in sub_genre:
-                return "Country music fans, typically 25-45, who appreciate traditional and rebellious themes"
-            elif "Pop" in sub_genre:
-                return "Mainstream country and pop fans, 18-35, with crossover appeal"
-            elif "Bluegrass" in sub_genre:
-                return "Traditional country and bluegrass enthusiasts, 30-60"
-            else:
-                return "Mainstream country music fans, 25-50, with broad appeal"
-                
-        elif selected_genre == "hip_hop_rap":
-            if sub_genre == 'Drill':
-                return "Young urban audience, typically 16-25"
-            elif sub_genre == 'Trap':
-                return "Mainstream hip-hop fans, 18-35"
-            elif sub_genre == 'Conscious':
-                return "Socially aware listeners, 20-40"
-            elif sub_genre == 'Boom Bap':
-                return "Hip-hop purists and intellectuals, 25-45"
-            elif sub_genre == 'Alternative':
-                return "Experimental music fans, 18-35"
-            else:
-                return "General hip-hop audience, 16-40"
-                
-        elif selected_genre == "pop":
-            if "Teen" in sub_genre:
-                return "Teenage and young adult audience, 13-25"
-            elif "Adult Contemporary" in sub_genre:
-                return "Adult listeners, 25-45, seeking sophisticated pop music"
-            elif "Electropop" in sub_genre:
-                return "Young adult audience, 18-30, who enjoy electronic elements"
-            else:
-                return "Mainstream pop audience, 15-40, with broad demographic appeal"
-                
-        elif selected_genre == "r_b":
-            if "Neo Soul" in sub_genre:
-                return "Soul music enthusiasts, 25-45, who appreciate conscious themes"
-            elif "Alternative" in sub_genre:
-                return "Experimental R&B fans, 20-35, seeking unique sounds"
-            elif "Hip-Hop Soul" in sub_genre:
-                return "Urban music fans, 18-35, who enjoy hip-hop and R&B fusion"
-            else:
-                return "Contemporary R&B fans, 20-40, with romantic and emotional appeal"
-                
-        elif selected_genre == "electronic_dance":
-            if "House" in sub_genre:
-                return "Club and dance music enthusiasts, 18-35"
-            elif "Dubstep" in sub_genre:
-                return "Bass music fans, 18-30, who enjoy heavy electronic sounds"
-            elif "Trance" in sub_genre:
-                return "Electronic music purists, 20-40, who appreciate melodic and atmospheric sounds"
-            else:
-                return "EDM and dance music fans, 18-35, with festival and club appeal"
-                
-        elif selected_genre == "rock":
-            if "Alternative" in sub_genre:
-                return "Indie and alternative rock fans, 20-40"
-            elif "Hard Rock" in sub_genre:
-                return "Heavy rock and metal fans, 18-35"
-            elif "Classic Rock" in sub_genre:
-                return "Rock music enthusiasts, 30-60, who appreciate timeless rock"
-            else:
-                return "Mainstream rock fans, 20-45, with broad rock appeal"
-        else:
+        audiences = TARGET_AUDIENCES.get(selected_genre)
+        if audiences is None:
             # Default for unknown genres
             return f"General {selected_genre.replace('_', ' ')} music fans, 18-45"
+        
+        default_audience, sub_genre_audiences = audiences
+        for sub_genre_name, audience in sub_genre_audiences:
+            if sub_genre_name in sub_genre:
+                return audience
+        return default_audience
     
-    def _analyze_lyrical_style(self, lyrics: str, words: List[str]) -> str:
+    def _analyze_lyrical_style(self, lyrics: str, words: List[str], word_counts: Counter = None) -> str:
         """Analyze the lyrical style and approach"""
-        avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
+        avg_word_length = sum(map(len, words)) / len(words) if words else 0
         
         if avg_word_length > 8:
             style = "Sophisticated vocabulary with complex word choices"
@@ -1083,7 +1956,7 @@ Return only a JSON object like this:
             style = "Direct and straightforward lyrical approach"
         
         # Check for repetition
-        unique_words = len(set(words))
+        unique_words = len(word_counts if word_counts is not None else set(words))
         repetition_ratio = unique_words / len(words) if words else 1
         
         if repetition_ratio < 0.6:
@@ -1095,17 +1968,15 @@ Return only a JSON object like this:
         
         return style
     
-    def _parse_song_description(self, ai_response: str) -> Dict[str, Any]:
-        """Parse AI response to extract song description"""
+    def _parse_song_description(self, ai_response: str) -> Optional[Dict[str, Any]]:
+        """Parse AI response to extract song description, returns None if the reply has no usable description"""
         try:
             # Extract JSON from response
-            json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
-            if json_match:
-                description_data = json.loads(json_match.group())
+            description_data = self._load_json_reply(ai_response, '{')
+            if isinstance(description_data, dict):
                 
                 # Ensure all required fields are present
-                required_fields = ['description', 'sub_genre', 'themes', 'mood', 'target_audience', 'lyrical_style']
-                for field in required_fields:
+                for field in DESCRIPTION_FIELDS:
                     if field not in description_data:
                         description_data[field] = "Not specified"
                 
@@ -1114,12 +1985,5 @@ Return only a JSON object like this:
                 raise ValueError("No JSON found in AI response")
                 
         except Exception as e:
-            print(f"Failed to parse AI song description: {e}")
-            return {
-                'description': 'AI analysis not available',
-                'sub_genre': 'Unknown',
-                'themes': ['Unknown'],
-                'mood': 'Unknown',
-                'target_audience': 'Unknown',
-                'lyrical_style': 'Unknown'
-            } 
\ No newline at end of file
+            log.warning("Failed to parse AI song description: %s", e)
+            return None 
\ No newline at end of file
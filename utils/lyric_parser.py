@@ -14,6 +14,8 @@ class LyricParser:
             'pre_chorus': r'\[pre.?chorus\]|\[Pre.?chorus\]|\[PRE.?CHORUS\]',
             'post_chorus': r'\[post.?chorus\]|\[Post.?chorus\]|\[POST.?CHORUS\]'
         }
+        # Every lyric line is checked against these, so compile them once
+        self._section_regexes = [(section_type, re.compile(pattern)) for section_type, pattern in self.section_patterns.items()]
         
     def parse_lyrics(self, lyrics: str) -> List[Dict[str, Any]]:
         """
@@ -70,8 +72,8 @@ class LyricParser:
         """Identify if a line is a section header"""
         line_lower = line.lower()
         
-        for section_type, pattern in self.section_patterns.items():
-            if re.search(pattern, line_lower):
+        for section_type, regex in self._section_regexes:
+            if regex.search(line_lower):
                 return section_type
         
         return None
@@ -0,0 +1,334 @@
+import os
+import logging
+import json
+import math
+import time
+import hashlib
+import operator
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+
+# Every cache hit deserializes its value, orjson does that several times faster than the json module when installed
+if ORJSON_AVAILABLE:
+    def _serialize(value: Any) -> bytes:
+        """Serialize a cached value"""
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Something orjson can't handle, let the json module have a go
+            return json.dumps(value).encode()
+
+    _deserialize = orjson.loads
+else:
+    _serialize = json.dumps
+    _deserialize = json.loads
+
+
+class ResponseCache:
+    """Thread-safe in-memory LRU cache (with TTL) for AI responses"""
+
+    backend = 'memory'
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from the inputs that determine a response"""
+        raw = '\x00'.join(str(part) for part in parts)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                # Entry expired, drop it
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        # Values are stored serialized so callers always get their own copy
+        return _deserialize(entry[1])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under a key"""
+        serialized = _serialize(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, serialized)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        """Number of entries currently cached"""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics for monitoring"""
+        total = self.hits + self.misses
+        return {
+            'backend': self.backend,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'size': self.size(),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl
+        }
+
+
+class RedisResponseCache(ResponseCache):
+    """Response cache backed by Redis so it can be shared between workers"""
+
+    backend = 'redis'
+
+    def __init__(self, url: str, maxsize: int = 1024, ttl: int = 3600, prefix: str = 'scoremybars:'):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            serialized = self._redis.get(self.prefix + key)
+        except redis.RedisError as e:
+            log.warning("Redis cache read failed: %s", e)
+            serialized = None
+
+        with self._lock:
+            if serialized is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return _deserialize(serialized)
+
+    def set(self, key: str, value: Any) -> None:
+        # Redis handles eviction itself (configure maxmemory-policy), we only set the TTL
+        try:
+            self._redis.set(self.prefix + key, _serialize(value), ex=self.ttl)
+        except redis.RedisError as e:
+            log.warning("Redis cache write failed: %s", e)
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(match=self.prefix + '*'):
+            self._redis.delete(key)
+
+    def size(self) -> int:
+        return sum(1 for _ in self._redis.scan_iter(match=self.prefix + '*'))
+
+
+class SqliteResponseCache(ResponseCache):
+    """Response cache stored in a local SQLite file so it survives restarts"""
+
+    backend = 'sqlite'
+
+    def __init__(self, path: str, maxsize: int = 1024, ttl: int = 3600, table: str = 'responses', timeout: float = 5.0):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.path = path
+        # Caches sharing a file each get their own table, so eviction and clear() stay separate
+        self.table = table
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection shared by every thread, guarded by the cache lock
+        # Other connections (workers, other caches) may hold the write lock, wait up to timeout seconds for it
+        self._db = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(f'CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, expires REAL, used REAL, value TEXT)')
+            self._db.execute(f'CREATE INDEX IF NOT EXISTS {table}_used ON {table} (used)')
+
+    def get(self, key: str) -> Optional[Any]:
+        # Wall-clock time, monotonic time does not carry over between restarts
+        now = time.time()
+        with self._lock:
+            try:
+                with self._db:
+                    row = self._db.execute(f'SELECT expires, value FROM {self.table} WHERE key = ?', (key,)).fetchone()
+                    if row is not None and row[0] < now:
+                        # Entry expired, drop it
+                        self._db.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                        row = None
+
+                    if row is not None:
+                        self._db.execute(f'UPDATE {self.table} SET used = ? WHERE key = ?', (now, key))
+            except sqlite3.Error as e:
+                log.warning("SQLite cache read failed: %s", e)
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return _deserialize(row[1])
+
+    def set(self, key: str, value: Any) -> None:
+        serialized = _serialize(value)
+        now = time.time()
+        with self._lock:
+            try:
+                with self._db:
+                    self._db.execute(f'INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)', (key, now + self.ttl, now, serialized))
+                    # Drop the least recently used entries once the cache is full
+                    self._db.execute(
+                        f'DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY used DESC LIMIT -1 OFFSET ?)',
+                        (self.maxsize,)
+                    )
+            except sqlite3.Error as e:
+                log.warning("SQLite cache write failed: %s", e)
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute(f'DELETE FROM {self.table}')
+
+    def size(self) -> int:
+        with self._lock:
+            return self._db.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+
+class SemanticCache:
+    """Thread-safe in-memory cache that reuses AI responses for near-duplicate lyrics, matched by embedding similarity"""
+
+    def __init__(self, threshold: float = 0.97, maxsize: int = 256):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (namespace, vector) -> serialized value, oldest first
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> tuple:
+        """Scale an embedding to unit length so a dot product is the cosine similarity"""
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        return tuple(x / norm for x in embedding)
+
+    def get(self, namespace: str, embedding: List[float]) -> Optional[Any]:
+        """Return the value cached for the most similar text in a namespace, or None if nothing is close enough"""
+        vector = self._normalize(embedding)
+        with self._lock:
+            best_key, best_similarity = None, self.threshold
+            for key in self._entries:
+                if key[0] != namespace:
+                    continue
+                similarity = sum(map(operator.mul, vector, key[1]))
+                if similarity >= best_similarity:
+                    best_key, best_similarity = key, similarity
+
+            if best_key is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            serialized = self._entries[best_key]
+
+        return _deserialize(serialized)
+
+    def set(self, namespace: str, embedding: List[float], value: Any) -> None:
+        """Store a JSON-serializable value for a text's embedding"""
+        key = (namespace, self._normalize(embedding))
+        serialized = _serialize(value)
+        with self._lock:
+            self._entries[key] = serialized
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics for monitoring"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'threshold': self.threshold
+        }
+
+
+def create_response_cache(namespace: str = 'responses') -> ResponseCache:
+    """
+    Create the response cache configured by environment variables
+    namespace keeps caches sharing a redis server or sqlite file apart (own key prefix or table)
+
+    RESPONSE_CACHE_BACKEND: 'memory' (default), 'redis' or 'sqlite'
+    RESPONSE_CACHE_SIZE: maximum number of entries kept
+    RESPONSE_CACHE_TTL: seconds before an entry expires
+    REDIS_URL: connection URL used by the redis backend
+    RESPONSE_CACHE_PATH: database file used by the sqlite backend
+    """
+    backend = os.getenv('RESPONSE_CACHE_BACKEND', 'memory').lower()
+    maxsize = int(os.getenv('RESPONSE_CACHE_SIZE', 1024))
+    ttl = int(os.getenv('RESPONSE_CACHE_TTL', 3600))
+
+    if backend == 'redis':
+        if REDIS_AVAILABLE:
+            try:
+                return RedisResponseCache(os.getenv('REDIS_URL', 'redis://localhost:6379/0'), maxsize=maxsize, ttl=ttl, prefix=f'scoremybars:{namespace}:')
+            except Exception as e:
+                log.warning("Redis response cache unavailable: %s", e)
+        else:
+            log.warning("redis not available, falling back to the in-memory response cache")
+    elif backend == 'sqlite':
+        path = os.getenv('RESPONSE_CACHE_PATH', os.path.expanduser('~/.cache/scoremybars/response_cache.sqlite'))
+        try:
+            return SqliteResponseCache(path, maxsize=maxsize, ttl=ttl, table=namespace)
+        except (OSError, sqlite3.Error) as e:
+            log.warning("SQLite response cache unavailable: %s", e)
+
+    return ResponseCache(maxsize=maxsize, ttl=ttl)
+
+
+def create_semantic_cache() -> Optional[SemanticCache]:
+    """
+    Create the semantic cache configured by environment variables, or None when it is turned off
+
+    SEMANTIC_CACHE: set to '1' to reuse responses for near-duplicate lyrics
+    SEMANTIC_CACHE_THRESHOLD: minimum cosine similarity that counts as a match
+    SEMANTIC_CACHE_SIZE: maximum number of entries kept in memory
+    """
+    if os.getenv('SEMANTIC_CACHE', '0') != '1':
+        return None
+
+    return SemanticCache(
+        threshold=float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.97)),
+        maxsize=int(os.getenv('SEMANTIC_CACHE_SIZE', 256))
+    )
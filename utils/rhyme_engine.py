@@ -1,6 +1,10 @@
 import re
+from functools import lru_cache
 from typing import List, Dict, Any, Tuple
 
+# Runs of consecutive vowels, each run is one syllable
+VOWEL_GROUP_PATTERN = re.compile(r'[aeiou]+')
+
 class RhymeEngine:
     """Analyzes rhyme patterns and density in rap lyrics"""
     
@@ -41,6 +45,14 @@ class RhymeEngine:
             'less': ['less', 'les']
         }
         
+        # Every ending that counts as a shared rhyme pattern (the pattern names and their variations)
+        self._rhyme_suffixes = tuple(sorted(
+            set(self.rhyme_patterns) | {variation for variations in self.rhyme_patterns.values() for variation in variations}
+        ))
+        
+        # Rhyme signatures are computed once per distinct word, then every pair check just compares them
+        self._rhyme_signature = lru_cache(maxsize=16384)(self._build_rhyme_signature)
+        
     def analyze_rhymes(self, text: str) -> Dict[str, Any]:
         """
         Analyze rhyme patterns in the given text
@@ -277,42 +289,29 @@ class RhymeEngine:
         if word1.endswith(word2) or word2.endswith(word1):
             return True
         
+        suffixes1, ending_pattern1, last_two1 = self._rhyme_signature(word1)
+        suffixes2, ending_pattern2, last_two2 = self._rhyme_signature(word2)
+        
         # Check for common rhyme patterns
-        for pattern, variations in self.rhyme_patterns.items():
-            if word1.endswith(pattern) and word2.endswith(pattern):
-                return True
-            for variation in variations:
-                if word1.endswith(variation) and word2.endswith(variation):
-                    return True
-        
-        # Check for vowel-consonant ending patterns
-        if len(word1) >= 3 and len(word2) >= 3:
-            # Get last 3 characters
-            end1 = word1[-3:]
-            end2 = word2[-3:]
-            
-            # Check if they have similar vowel-consonant patterns
-            if self._similar_ending_pattern(end1, end2):
-                return True
+        if not suffixes1.isdisjoint(suffixes2):
+            return True
         
-        # Check for similar endings (last 2-4 characters)
-        for length in [2, 3, 4]:
-            if len(word1) >= length and len(word2) >= length:
-                if word1[-length:] == word2[-length:]:
-                    return True
+        # Check for similar vowel-consonant patterns in the last 3 characters
+        if ending_pattern1 is not None and ending_pattern1 == ending_pattern2:
+            return True
         
-        return False
+        # Check for similar endings (matching last 3 or 4 characters implies the last 2 match)
+        return last_two1 is not None and last_two1 == last_two2
     
-    def _similar_ending_pattern(self, end1: str, end2: str) -> bool:
-        """Check if two word endings have similar vowel-consonant patterns"""
-        if len(end1) != len(end2):
-            return False
-        
-        # Convert to vowel/consonant pattern
-        pattern1 = ''.join(['V' if c in self.vowels else 'C' for c in end1])
-        pattern2 = ''.join(['V' if c in self.vowels else 'C' for c in end2])
-        
-        return pattern1 == pattern2
+    def _build_rhyme_signature(self, word: str) -> Tuple[frozenset, Any, Any]:
+        """
+        Precompute what _words_rhyme compares for a cleaned word:
+        the rhyme pattern endings it has, the vowel/consonant pattern of its last 3 characters, and its last 2 characters
+        """
+        suffixes = frozenset(suffix for suffix in self._rhyme_suffixes if word.endswith(suffix))
+        ending_pattern = ''.join(['V' if c in self.vowels else 'C' for c in word[-3:]]) if len(word) >= 3 else None
+        last_two = word[-2:] if len(word) >= 2 else None
+        return suffixes, ending_pattern, last_two
     
     def _get_rhyme_key(self, word: str) -> str:
         """Get a rhyme key for grouping similar rhymes"""
@@ -346,17 +345,9 @@ class RhymeEngine:
     def _count_syllables(self, word: str) -> int:
         """Count syllables in a word using vowel groups"""
         word = word.lower()
-        vowels = 'aeiou'
-        
-        # Count vowel groups
-        syllable_count = 0
-        prev_char_was_vowel = False
         
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not prev_char_was_vowel:
-                syllable_count += 1
-            prev_char_was_vowel = is_vowel
+        # Count vowel groups (the regex scan runs in C instead of a per-character Python loop)
+        syllable_count = len(VOWEL_GROUP_PATTERN.findall(word))
         
         # Handle silent 'e' at the end
         if word.endswith('e') and syllable_count > 1:
@@ -0,0 +1,11 @@
+# =============================================================================
+# ScoreMyBars - WSGI Entry Point
+# =============================================================================
+# Production servers import the Flask app from here, e.g.:
+#   gunicorn wsgi:app
+# Worker settings are read from gunicorn.conf.py
+
+from app import app
+
+if __name__ == '__main__':
+    app.run()